@@ -90,37 +90,33 @@ class ChessSprites:
         desired_w = square * pad
         scale = desired_w / self.cell_pixel_width  # scale against PNG pixel width
 
-        for rank in range(8):
-            for file in range(8):
-                tile = board.grid[rank][file]
-                if not tile.has_piece():
-                    continue
-
-                piece = tile.piece_here
-
-                # Convert board coordinates to visual coordinates based on user color
-                if user_color and hasattr(user_color, 'name') and user_color.name == 'BLACK':
-                    visual_file = 7 - file
-                    visual_rank = 7 - rank
-                else:
-                    visual_file = file
-                    visual_rank = rank
-
-                #Checks if piece already has sprite
-                if id(piece) in self._by_piece_id:
-                    spr = self._by_piece_id[id(piece)]
-                    spr.center_x, spr.center_y = self._tile_center(
-                        origin_x, origin_y, square, visual_rank, visual_file)
-
-                else:
-
-                    tex = self.sheet.get_texture(piece.color, piece.piece_type)
-
-                    spr = arcade.Sprite(tex, scale=scale)
-                    spr.center_x, spr.center_y = self._tile_center(
-                        origin_x, origin_y, square, visual_rank, visual_file)
-                    self.sprite_list.append(spr)
-                    self._by_piece_id[id(piece)] = spr
+        # Only live pieces need sprites, so read the board's piece lists
+        for piece in board.pieces():
+            file, rank = piece.current_pos
+
+            # Convert board coordinates to visual coordinates based on user color
+            if user_color and hasattr(user_color, 'name') and user_color.name == 'BLACK':
+                visual_file = 7 - file
+                visual_rank = 7 - rank
+            else:
+                visual_file = file
+                visual_rank = rank
+
+            #Checks if piece already has sprite
+            if id(piece) in self._by_piece_id:
+                spr = self._by_piece_id[id(piece)]
+                spr.center_x, spr.center_y = self._tile_center(
+                    origin_x, origin_y, square, visual_rank, visual_file)
+
+            else:
+
+                tex = self.sheet.get_texture(piece.color, piece.piece_type)
+
+                spr = arcade.Sprite(tex, scale=scale)
+                spr.center_x, spr.center_y = self._tile_center(
+                    origin_x, origin_y, square, visual_rank, visual_file)
+                self.sprite_list.append(spr)
+                self._by_piece_id[id(piece)] = spr
 
     """
      sync_from_board now accepts user_color parameter for switching sides
@@ -0,0 +1,177 @@
+"""
+Precomputed attack tables for move generation.
+
+Knight, king and pawn attacks are plain per-square lookups. Slider attacks
+use the magic-bitboard layout: each square has a mask of the squares whose
+occupancy can block its rays, and the attack set is looked up from the
+occupancy under that mask. The occupancy subset itself is the key into a
+per-square dict, which plays the part of the magic multiply/PEXT index in
+C engines; in CPython the dict hash is cheaper than a 64-bit multiply.
+All tables are built once at import time.
+"""
+from _enums.color import Color
+
+KNIGHT_OFFSETS = [(2, 1), (2, -1), (-2, 1), (-2, -1),
+                  (1, 2), (1, -2), (-1, 2), (-1, -2)]
+KING_OFFSETS = [(1, 0), (1, 1), (1, -1), (-1, -1),
+                (-1, 0), (-1, 1), (0, 1), (0, -1)]
+ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+BISHOP_DIRECTIONS = [(-1, 1), (1, 1), (-1, -1), (1, -1)]
+
+
+def _step_attacks(square: int, offsets: list[tuple[int, int]]) -> int:
+    """Build the attack set of a non-sliding piece from its move offsets"""
+    file, rank = square & 7, square >> 3
+    attacks = 0
+    for x_offset, y_offset in offsets:
+        new_file, new_rank = file + x_offset, rank + y_offset
+        if 0 <= new_file <= 7 and 0 <= new_rank <= 7:
+            attacks |= 1 << (new_rank * 8 + new_file)
+    return attacks
+
+
+def _ray_attacks(square: int, directions: list[tuple[int, int]], occupied: int) -> int:
+    """Walk slider rays from a square, stopping on the first occupied square"""
+    file, rank = square & 7, square >> 3
+    attacks = 0
+    for x_offset, y_offset in directions:
+        new_file, new_rank = file + x_offset, rank + y_offset
+        while 0 <= new_file <= 7 and 0 <= new_rank <= 7:
+            bit = 1 << (new_rank * 8 + new_file)
+            attacks |= bit
+            if occupied & bit:
+                break
+            new_file += x_offset
+            new_rank += y_offset
+    return attacks
+
+
+def _relevant_mask(square: int, directions: list[tuple[int, int]]) -> int:
+    """Squares whose occupancy can change a slider's attacks (board edges excluded)"""
+    file, rank = square & 7, square >> 3
+    mask = 0
+    for x_offset, y_offset in directions:
+        new_file, new_rank = file + x_offset, rank + y_offset
+        # Stop one short of the edge; the last square on a ray is always attacked
+        while (0 <= new_file + x_offset <= 7 and 0 <= new_rank + y_offset <= 7):
+            mask |= 1 << (new_rank * 8 + new_file)
+            new_file += x_offset
+            new_rank += y_offset
+    return mask
+
+
+def _slider_table(square: int, mask: int, directions: list[tuple[int, int]]) -> dict[int, int]:
+    """Map every occupancy subset of a mask to the resulting attack set"""
+    table = {}
+    subset = 0
+    # Carry-rippler trick enumerates every subset of the mask
+    while True:
+        table[subset] = _ray_attacks(square, directions, subset)
+        subset = (subset - mask) & mask
+        if subset == 0:
+            break
+    return table
+
+
+KNIGHT_ATTACKS = [_step_attacks(square, KNIGHT_OFFSETS) for square in range(64)]
+KING_ATTACKS = [_step_attacks(square, KING_OFFSETS) for square in range(64)]
+
+# PAWN_ATTACKS[color][square] -> squares a pawn of that color captures on
+PAWN_ATTACKS = {
+    Color.WHITE: [_step_attacks(square, [(1, 1), (-1, 1)]) for square in range(64)],
+    Color.BLACK: [_step_attacks(square, [(1, -1), (-1, -1)]) for square in range(64)],
+}
+
+ROOK_MASKS = [_relevant_mask(square, ROOK_DIRECTIONS) for square in range(64)]
+BISHOP_MASKS = [_relevant_mask(square, BISHOP_DIRECTIONS) for square in range(64)]
+
+ROOK_TABLE = [_slider_table(square, ROOK_MASKS[square], ROOK_DIRECTIONS)
+              for square in range(64)]
+BISHOP_TABLE = [_slider_table(square, BISHOP_MASKS[square], BISHOP_DIRECTIONS)
+                for square in range(64)]
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    """
+    Get the squares a rook attacks
+
+    Args:
+        square: Square index of the rook
+        occupied: Bitboard of all occupied squares
+    Returns:
+        Bitboard of attacked squares, including the first blocker on each ray
+    """
+    return ROOK_TABLE[square][occupied & ROOK_MASKS[square]]
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    """
+    Get the squares a bishop attacks
+
+    Args:
+        square: Square index of the bishop
+        occupied: Bitboard of all occupied squares
+    Returns:
+        Bitboard of attacked squares, including the first blocker on each ray
+    """
+    return BISHOP_TABLE[square][occupied & BISHOP_MASKS[square]]
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    """
+    Get the squares a queen attacks
+
+    Args:
+        square: Square index of the queen
+        occupied: Bitboard of all occupied squares
+    Returns:
+        Bitboard of attacked squares, including the first blocker on each ray
+    """
+    return (ROOK_TABLE[square][occupied & ROOK_MASKS[square]] |
+            BISHOP_TABLE[square][occupied & BISHOP_MASKS[square]])
+
+
+def pawn_pushes(square: int, color: Color, occupied: int) -> int:
+    """
+    Get the squares a pawn can advance to without capturing
+
+    Args:
+        square: Square index of the pawn
+        color: Color of the pawn
+        occupied: Bitboard of all occupied squares
+    Returns:
+        Bitboard of the single push and, from the start rank, the double push
+    """
+    if color == Color.WHITE:
+        single = (1 << (square + 8)) & ~occupied if square < 56 else 0
+        if single and 8 <= square < 16:
+            return single | ((1 << (square + 16)) & ~occupied)
+    else:
+        single = (1 << (square - 8)) & ~occupied if square >= 8 else 0
+        if single and 48 <= square < 56:
+            return single | ((1 << (square - 16)) & ~occupied)
+    return single
+
+
+
+def _between(square: int, other: int) -> int:
+    """Squares strictly between two squares on a shared line, 0 if not aligned"""
+    file, rank = square & 7, square >> 3
+    other_file, other_rank = other & 7, other >> 3
+    x_diff, y_diff = other_file - file, other_rank - rank
+    if square == other or not (x_diff == 0 or y_diff == 0 or abs(x_diff) == abs(y_diff)):
+        return 0
+
+    x_step = (x_diff > 0) - (x_diff < 0)
+    y_step = (y_diff > 0) - (y_diff < 0)
+    squares = 0
+    new_file, new_rank = file + x_step, rank + y_step
+    while (new_file, new_rank) != (other_file, other_rank):
+        squares |= 1 << (new_rank * 8 + new_file)
+        new_file += x_step
+        new_rank += y_step
+    return squares
+
+
+# BETWEEN[a][b] -> squares strictly between a and b when they share a line
+BETWEEN = [[_between(square, other) for other in range(64)] for square in range(64)]
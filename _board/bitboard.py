@@ -0,0 +1,86 @@
+"""
+Bitboard helpers shared by the board and move generation.
+
+Squares are numbered 0-63 as rank * 8 + file, so a1 is bit 0 and h8 is bit 63.
+"""
+
+FULL_BOARD = 0xFFFF_FFFF_FFFF_FFFF
+
+FILE_A = 0x0101_0101_0101_0101
+FILE_H = FILE_A << 7
+RANK_1 = 0xFF
+RANK_8 = RANK_1 << 56
+
+
+def square_index(file: int, rank: int) -> int:
+    """
+    Convert board coordinates to a square index
+
+    Args:
+        file: The file (column) position (0-7)
+        rank: The rank (row) position (0-7)
+    Returns:
+        Square index in the range 0-63
+    """
+    return rank * 8 + file
+
+
+def square_coords(square: int) -> tuple[int, int]:
+    """
+    Convert a square index back to board coordinates
+
+    Args:
+        square: Square index in the range 0-63
+    Returns:
+        Tuple of (file, rank)
+    """
+    return (square & 7, square >> 3)
+
+
+def popcount(bitboard: int) -> int:
+    """
+    Count the number of set squares in a bitboard
+
+    Args:
+        bitboard: 64-bit square set
+    Returns:
+        Number of squares in the set
+    """
+    return bitboard.bit_count()
+
+
+def lsb(bitboard: int) -> int:
+    """
+    Get the index of the lowest set square in a bitboard
+
+    Args:
+        bitboard: Non-empty 64-bit square set
+    Returns:
+        Square index of the least significant bit
+    """
+    return (bitboard & -bitboard).bit_length() - 1
+
+
+def iter_squares(bitboard: int):
+    """
+    Yield the index of every set square in a bitboard, lowest first
+
+    Args:
+        bitboard: 64-bit square set
+    """
+    while bitboard:
+        low_bit = bitboard & -bitboard
+        yield low_bit.bit_length() - 1
+        bitboard ^= low_bit
+
+
+def squares_to_coords(bitboard: int) -> list[tuple[int, int]]:
+    """
+    Convert a bitboard into a list of board coordinates
+
+    Args:
+        bitboard: 64-bit square set
+    Returns:
+        List of (file, rank) tuples, lowest square first
+    """
+    return [(square & 7, square >> 3) for square in iter_squares(bitboard)]
@@ -1,6 +1,7 @@
 """
 Board class which manages chess _board state and piece movements.
 """
+from array import array
 from typing import List
 from _pieces.piece import Piece, PieceType, Color
 from _pieces.bishop import Bishop
@@ -10,11 +11,69 @@ from _pieces.pawn import Pawn
 from _pieces.queen import Queen
 from _pieces.rook import Rook
 from _board.tile import Tile
+from _enums.piece_value import PieceValue
+from _enums.game_status import GameStatus
+from _board.bitboard import FULL_BOARD, iter_squares, lsb, popcount, squares_to_coords
+from _board.attacks import (BETWEEN, KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS,
+                            bishop_attacks, rook_attacks)
+from _board.castling import (BLACK_KINGSIDE, BLACK_QUEENSIDE, CASTLING_MASKS,
+                             CASTLING_ROOKS, WHITE_KINGSIDE, WHITE_QUEENSIDE)
+from _board.move import (CAPTURE, DOUBLE_PUSH, EN_PASSANT, KING_CASTLE, PROMOTION,
+                         QUEEN_CASTLE, QUIET, move_to_tuple)
+from _board.move_cache import MoveCache
+from _board.evaluation import ENDGAME_SCORES, MAX_PHASE, MIDGAME_SCORES, PHASE_WEIGHTS
+from _board.position import EMPTY_SQUARE, Position
+from _board.zobrist import CASTLING_KEYS, EN_PASSANT_KEYS, PIECE_KEYS, SIDE_KEY
+
+PROMOTION_CLASSES = {
+    PieceType.QUEEN: Queen,
+    PieceType.ROOK: Rook,
+    PieceType.BISHOP: Bishop,
+    PieceType.KNIGHT: Knight,
+}
+
+# FEN letter -> piece class
+FEN_PIECE_CLASSES = {
+    'p': Pawn,
+    'r': Rook,
+    'n': Knight,
+    'b': Bishop,
+    'q': Queen,
+    'k': King,
+}
+
+# Castling right lost when the rook on that square has moved
+ROOK_CASTLING_RIGHTS = {
+    (0, 0): WHITE_QUEENSIDE,
+    (7, 0): WHITE_KINGSIDE,
+    (0, 7): BLACK_QUEENSIDE,
+    (7, 7): BLACK_KINGSIDE,
+}
+
+# Material worth of each piece type; the king keeps its nominal 1000
+MATERIAL_VALUES = {piece_type: PieceValue[piece_type.name].value for piece_type in PieceType}
 
 class Board:
     """
     Represents a chess _board with an 8x8 grid of tiles.
     Manages piece placement, movement, and check detection
+
+    Alongside the grid the board keeps one 64-bit bitboard per color and
+    piece type plus occupancy masks (bit = rank * 8 + file), a per-color
+    square -> piece index in piece_lists, and running piece counts,
+    material totals and piece-square sums for evaluate(). Every change to piece placement goes through
+    _place_piece/_remove_piece so none of these drift from the grid.
+
+    zobrist_key is a 64-bit hash of the position (pieces, side to move,
+    castling rights and a capturable en passant file) that those helpers
+    and push/pop keep up to date incrementally. Legal move generation is
+    memoized per (zobrist_key, color) in move_cache, so any mutation that
+    changes the key also stops old results from being served.
+
+    Queries (check_for_checks, check_if_move_into_check, is_legal,
+    legal_move_masks, generate_moves, game_status) only read the position
+    and the locked move cache, so a GUI thread can call them while
+    another thread searches its own clone().
     """
 
     def __init__(self) -> None:
@@ -24,15 +83,37 @@ class Board:
         # initialized to none, replaced by Tile objects later
         self.grid: List[List[Tile]] = [[None for _ in range(8)] for _ in range(8)]
         self.selected_piece = None
-        self.checking_for_checks = False
         self.en_passant_target = None
+        self.active_color = Color.WHITE
+        self.castling_rights = 0
+        self.zobrist_key = 0
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.status_memo = None
+        self.fen_memo = (None, None)
         self.move_history = []
+        self.undo_stack = []
+        self.move_cache = MoveCache()
         self.current_index = -1
-        self.material_differential = 0
         self.checkmate = False
         self.stalemate = False
         self.mate_color = None
 
+        # bitboards[color][piece_type] -> set of squares holding that piece
+        self.bitboards = {}
+        self.occupancy = {}
+        self.occupied = 0
+        # piece_lists[color][square] -> live piece, so scans skip empty tiles
+        self.piece_lists = {}
+        # piece_counts[color][piece_type] and material[color] are running totals
+        self.piece_counts = {}
+        self.material = {}
+        # Running piece-square sums (White positive) and game phase for evaluate()
+        self.midgame_score = 0
+        self.endgame_score = 0
+        self.phase = 0
+        self.clear_bitboards()
+
         # assign tile objects to None lists
         for rank in range(8):
             for file in range(8):
@@ -43,38 +124,254 @@ class Board:
                 self.grid[rank][file] = Tile(file, rank, is_light)
         self.initialize_pieces()
 
+    def clear_bitboards(self):
+        """Empty every piece bitboard and occupancy mask"""
+        self.bitboards = {color: {piece_type: 0 for piece_type in PieceType}
+                          for color in Color}
+        self.occupancy = {Color.WHITE: 0, Color.BLACK: 0}
+        self.occupied = 0
+        self.piece_lists = {Color.WHITE: {}, Color.BLACK: {}}
+        self.piece_counts = {color: {piece_type: 0 for piece_type in PieceType}
+                             for color in Color}
+        self.material = {Color.WHITE: 0, Color.BLACK: 0}
+        self.midgame_score = 0
+        self.endgame_score = 0
+        self.phase = 0
+        self.zobrist_key = 0
+
+    def _place_piece(self, piece: Piece, file: int, rank: int):
+        """
+        Put a piece on a tile and record it in the bitboards
+
+        Args:
+            piece: The piece to place
+            file: Target file (0-7)
+            rank: Target rank (0-7)
+        """
+        bit = 1 << (rank * 8 + file)
+        self.grid[rank][file].piece_here = piece
+        self.bitboards[piece.color][piece.piece_type] |= bit
+        self.occupancy[piece.color] |= bit
+        self.occupied |= bit
+        self.piece_lists[piece.color][rank * 8 + file] = piece
+        self.piece_counts[piece.color][piece.piece_type] += 1
+        self.material[piece.color] += MATERIAL_VALUES[piece.piece_type]
+        self.midgame_score += MIDGAME_SCORES[piece.color][piece.piece_type][rank * 8 + file]
+        self.endgame_score += ENDGAME_SCORES[piece.color][piece.piece_type][rank * 8 + file]
+        self.phase += PHASE_WEIGHTS[piece.piece_type]
+        self.zobrist_key ^= PIECE_KEYS[piece.color][piece.piece_type][rank * 8 + file]
+
+    def _remove_piece(self, file: int, rank: int):
+        """
+        Take the piece on a tile off the board and out of the bitboards
+
+        Args:
+            file: File of the tile (0-7)
+            rank: Rank of the tile (0-7)
+        Returns:
+            The removed piece, or None if the tile was empty
+        """
+        tile = self.grid[rank][file]
+        piece = tile.piece_here
+        if piece is None:
+            return None
+
+        mask = ~(1 << (rank * 8 + file))
+        self.bitboards[piece.color][piece.piece_type] &= mask
+        self.occupancy[piece.color] &= mask
+        self.occupied &= mask
+        del self.piece_lists[piece.color][rank * 8 + file]
+        self.piece_counts[piece.color][piece.piece_type] -= 1
+        self.material[piece.color] -= MATERIAL_VALUES[piece.piece_type]
+        self.midgame_score -= MIDGAME_SCORES[piece.color][piece.piece_type][rank * 8 + file]
+        self.endgame_score -= ENDGAME_SCORES[piece.color][piece.piece_type][rank * 8 + file]
+        self.phase -= PHASE_WEIGHTS[piece.piece_type]
+        self.zobrist_key ^= PIECE_KEYS[piece.color][piece.piece_type][rank * 8 + file]
+        tile.piece_here = None
+        return piece
+
+    def _en_passant_hash(self) -> int:
+        """
+        Get the en passant part of the position key
+
+        Returns:
+            The en passant file key if a pawn of the side to move can
+            capture onto the target square, 0 otherwise
+        """
+        if self.en_passant_target is None:
+            return 0
+
+        file, rank = self.en_passant_target
+        attackers = PAWN_ATTACKS[self.active_color.opposite()][rank * 8 + file]
+        if attackers & self.bitboards[self.active_color][PieceType.PAWN]:
+            return EN_PASSANT_KEYS[file]
+        return 0
+
+    def compute_zobrist(self) -> int:
+        """
+        Compute the position key from scratch
+
+        Returns:
+            64-bit Zobrist key of the current position
+        """
+        key = 0
+        for color, pieces in self.bitboards.items():
+            for piece_type, squares in pieces.items():
+                piece_keys = PIECE_KEYS[color][piece_type]
+                for square in iter_squares(squares):
+                    key ^= piece_keys[square]
+
+        if self.active_color == Color.BLACK:
+            key ^= SIDE_KEY
+        key ^= CASTLING_KEYS[self.castling_rights]
+        return key ^ self._en_passant_hash()
+
+    def castling_rights_from_placement(self) -> int:
+        """
+        Work out castling rights from where the kings and rooks stand
+
+        Returns:
+            Castling rights bits for every king and rook on its home square
+        """
+        rights = 0
+        for color, row, kingside, queenside in (
+                (Color.WHITE, 0, WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                (Color.BLACK, 7, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            pieces = self.bitboards[color]
+            if pieces[PieceType.KING] & (1 << (row * 8 + 4)):
+                if pieces[PieceType.ROOK] & (1 << (row * 8 + 7)):
+                    rights |= kingside
+                if pieces[PieceType.ROOK] & (1 << (row * 8)):
+                    rights |= queenside
+        return rights
+
+    def piece_at(self, square: int):
+        """
+        Get the piece on a square index
+
+        Args:
+            square: Square index (rank * 8 + file)
+        Returns:
+            The Piece on that square, None if empty
+        """
+        return self.grid[square >> 3][square & 7].piece_here
+
+    def clone(self) -> "Board":
+        """
+        Copy the position into an independent board for analysis.
+        Bitboards and counters are plain ints, so they are copied as is;
+        tiles and pieces are duplicated so neither board can see the
+        other's moves. The copy starts with empty move history, undo
+        stack and move cache.
+
+        Returns:
+            A new Board in the same position
+        """
+        board = Board.__new__(Board)
+        board.__dict__.update(self.__dict__)
+
+        board.grid = [[Tile(tile.file, tile.rank, tile.is_light_square) for tile in row]
+                      for row in self.grid]
+        board.piece_lists = {Color.WHITE: {}, Color.BLACK: {}}
+        for color, pieces in self.piece_lists.items():
+            for square, piece in pieces.items():
+                piece = piece.copy()
+                board.piece_lists[color][square] = piece
+                board.grid[square >> 3][square & 7].piece_here = piece
+
+        board.bitboards = {color: dict(pieces) for color, pieces in self.bitboards.items()}
+        board.occupancy = dict(self.occupancy)
+        board.piece_counts = {color: dict(counts) for color, counts in self.piece_counts.items()}
+        board.material = dict(self.material)
+
+        board.selected_piece = None
+        board.status_memo = None
+        board.move_history = []
+        board.undo_stack = []
+        board.move_cache = MoveCache(self.move_cache.max_size)
+        board.current_index = -1
+        return board
+
+    def snapshot(self) -> Position:
+        """
+        Take an immutable, hashable and picklable copy of the position
+
+        Returns:
+            Position holding the placement, side to move, castling
+            rights, en passant target and clocks
+        """
+        placement = [EMPTY_SQUARE] * 64
+        for color, pieces in self.piece_lists.items():
+            for square, piece in pieces.items():
+                letter = piece.piece_type.value
+                placement[square] = letter.upper() if color == Color.WHITE else letter.lower()
+
+        return Position(''.join(placement), self.active_color, self.castling_rights,
+                        self.en_passant_target, self.halfmove_clock, self.fullmove_number)
+
+    @classmethod
+    def from_position(cls, position: Position) -> "Board":
+        """
+        Build a board from a snapshot, e.g. inside a worker process
+
+        Args:
+            position: The snapshot to set up
+        Returns:
+            A new Board in that position
+        """
+        board = cls()
+        board.load_fen(position.to_fen())
+        return board
+
+    def pieces(self, color: Color = None) -> list[Piece]:
+        """
+        Get the pieces still on the board
+
+        Args:
+            color: Only return pieces of this color, both colors if None
+        Returns:
+            List of live pieces, read from the piece lists instead of the grid
+        """
+        if color is not None:
+            return list(self.piece_lists[color].values())
+        return [*self.piece_lists[Color.WHITE].values(),
+                *self.piece_lists[Color.BLACK].values()]
+
     def initialize_pieces(self):
         """Initialize and populate all pieces to starting locations on the board"""
         # Pawns
         for file in range(8):
-            self.grid[1][file].piece_here = Pawn(Color.WHITE, (file, 1))
-            self.grid[6][file].piece_here = Pawn(Color.BLACK, (file, 6))
+            self._place_piece(Pawn(Color.WHITE, (file, 1)), file, 1)
+            self._place_piece(Pawn(Color.BLACK, (file, 6)), file, 6)
 
         # Kings
-        self.grid[0][4].piece_here = King(Color.WHITE, (4, 0))
-        self.grid[7][4].piece_here = King(Color.BLACK, (4, 7))
+        self._place_piece(King(Color.WHITE, (4, 0)), 4, 0)
+        self._place_piece(King(Color.BLACK, (4, 7)), 4, 7)
 
         # Queens
-        self.grid[0][3].piece_here = Queen(Color.WHITE, (3, 0))
-        self.grid[7][3].piece_here = Queen(Color.BLACK, (3, 7))
+        self._place_piece(Queen(Color.WHITE, (3, 0)), 3, 0)
+        self._place_piece(Queen(Color.BLACK, (3, 7)), 3, 7)
 
         # Rooks
-        self.grid[0][0].piece_here = Rook(Color.WHITE, (0, 0))
-        self.grid[0][7].piece_here = Rook(Color.WHITE, (7, 0))
-        self.grid[7][0].piece_here = Rook(Color.BLACK, (0, 7))
-        self.grid[7][7].piece_here = Rook(Color.BLACK, (7, 7))
+        self._place_piece(Rook(Color.WHITE, (0, 0)), 0, 0)
+        self._place_piece(Rook(Color.WHITE, (7, 0)), 7, 0)
+        self._place_piece(Rook(Color.BLACK, (0, 7)), 0, 7)
+        self._place_piece(Rook(Color.BLACK, (7, 7)), 7, 7)
 
         # Knights
-        self.grid[0][1].piece_here = Knight(Color.WHITE, (1, 0))
-        self.grid[0][6].piece_here = Knight(Color.WHITE, (6, 0))
-        self.grid[7][1].piece_here = Knight(Color.BLACK, (1, 7))
-        self.grid[7][6].piece_here = Knight(Color.BLACK, (6, 7))
+        self._place_piece(Knight(Color.WHITE, (1, 0)), 1, 0)
+        self._place_piece(Knight(Color.WHITE, (6, 0)), 6, 0)
+        self._place_piece(Knight(Color.BLACK, (1, 7)), 1, 7)
+        self._place_piece(Knight(Color.BLACK, (6, 7)), 6, 7)
 
         # Bishops
-        self.grid[0][2].piece_here = Bishop(Color.WHITE, (2, 0))
-        self.grid[0][5].piece_here = Bishop(Color.WHITE, (5, 0))
-        self.grid[7][2].piece_here = Bishop(Color.BLACK, (2, 7))
-        self.grid[7][5].piece_here = Bishop(Color.BLACK, (5, 7))
+        self._place_piece(Bishop(Color.WHITE, (2, 0)), 2, 0)
+        self._place_piece(Bishop(Color.WHITE, (5, 0)), 5, 0)
+        self._place_piece(Bishop(Color.BLACK, (2, 7)), 2, 7)
+        self._place_piece(Bishop(Color.BLACK, (5, 7)), 5, 7)
+
+        self.castling_rights = self.castling_rights_from_placement()
+        self.zobrist_key = self.compute_zobrist()
 
         #Sets initial board layout in previous move shower
         self.move_history.append( {
@@ -82,84 +379,45 @@ class Board:
             "From": None,
             "To": None,
             "Captured": None,
+            "Promotion": None,
             "FEN": self.board_state()
         })
         self.current_index = len(self.move_history) - 1
 
-    def move_piece(self, file, rank):
+    def move_piece(self, file, rank, promotion: PieceType = None):
         """
         Move the selected piece to the specified file and rank.
         Handles special moves like castling and updates _board state.
+
+        Args:
+            file: Destination file
+            rank: Destination rank
+            promotion: Piece type a pawn promotes to, queen if not given
         """
 
         if not self.is_curr_pos():
             return
 
-        before_move = self.selected_piece.get_position()
-        before_move_rank = before_move[1]
-        before_move_file = before_move[0]
+        piece = self.selected_piece
+        before_move = piece.get_position()
+        captured_piece = self.push((before_move, (file, rank), promotion))
 
-        captured_piece = self.grid[rank][file].piece_here
         if captured_piece:
-            # very piece_value is enum, need the integer .value
-            piece_val = captured_piece.piece_value.value
-            # print(f"DEBUG: Captured {captured_piece.color} {captured_piece.piece_type} worth {piece_val}")
-            # print(f"DEBUG: Material Differential Before: {self.material_differential}")
-            if captured_piece.color == Color.WHITE:
-                self.material_differential -= piece_val
-                print("WHITE captured")
-            if captured_piece.color == Color.BLACK:
-                self.material_differential += piece_val
-                print("BLACK captured")
-
-            # print(f"DEBUG: Material Differential After: {self.material_differential}")
-            # Actually call the delete method
-            captured_piece.delete()
-
-        self.selected_piece.move((file, rank), self)
+            print(f"{captured_piece.color.name} captured")
 
-        self.grid[rank][file].piece_here = self.selected_piece
-        self.grid[before_move_rank][before_move_file].piece_here = None
-
-        self.material_differential = self.calculate_material()
-        piece = self.selected_piece
         # CASTLING
-        if piece.piece_type == PieceType.KING and before_move_file == 4:
-            if piece.color == Color.WHITE and rank == 0 and file == 6:
-                rook = self.grid[0][7].get_piece_here()
-                if rook:
-                    self.grid[0][5].piece_here = rook
-                    self.grid[0][7].piece_here = None
-                    rook.current_pos = (5, 0)
-                    print("White short castle")
-
-            elif piece.color == Color.WHITE and rank == 0 and file == 2:
-                rook = self.grid[0][0].get_piece_here()
-                if rook:
-                    self.grid[0][3].piece_here = rook
-                    self.grid[0][0].piece_here = None
-                    rook.current_pos = (3, 0)
-                    print("White long castle")
-
-            elif piece.color == Color.BLACK and rank == 7 and file == 6:
-                rook = self.grid[7][7].get_piece_here()
-                if rook:
-                    self.grid[7][5].piece_here = rook
-                    self.grid[7][7].piece_here = None
-                    rook.current_pos = (5, 7)
-                    print("Black short castle")
-
-            elif piece.color == Color.BLACK and rank == 7 and file == 2:
-                rook = self.grid[7][0].get_piece_here()
-                if rook:
-                    self.grid[7][3].piece_here = rook
-                    self.grid[7][0].piece_here = None
-                    rook.current_pos = (3, 7)
-                    print("Black long castle")
+        if piece.piece_type == PieceType.KING and abs(file - before_move[0]) == 2:
+            side = "short" if file == 6 else "long"
+            print(f"{piece.color.name.title()} {side} castle")
+
+        # PROMOTION (a queen unless the caller asked for another piece)
+        landed = self.grid[rank][file].piece_here
+        promotion = landed.piece_type if landed is not piece else None
+        if promotion:
+            print(f"{piece.color.name} PAWN PROMOTED!")
 
         # Check if enemy is in check after move
-        piece = self.selected_piece
-        enemy_color = Color.BLACK if piece.color == Color.WHITE else Color.WHITE
+        enemy_color = piece.color.opposite()
 
         if self.check_for_checks(enemy_color):
             print(f"{enemy_color.name} is in check!")
@@ -173,6 +431,7 @@ class Board:
             "From": before_move,
             "To": (file, rank),
             "Captured": captured_piece,
+            "Promotion": promotion,
             "FEN": self.board_state()
         })
 
@@ -180,6 +439,160 @@ class Board:
         self.current_index = len(self.move_history) - 1
         self.selected_piece = None
 
+    def push(self, move):
+        """
+        Apply a move in place and remember how to take it back with pop().
+        Handles captures, en passant, castling rook moves, promotion,
+        has_moved flags and the en passant target.
+
+        Args:
+            move: Encoded move from generate_moves, or a tuple of
+                  (from_pos, to_pos) or (from_pos, to_pos, promotion) with
+                  positions as (file, rank) and promotion as a PieceType.
+                  A pawn reaching the last rank becomes a queen by default
+        Returns:
+            The captured piece, or None
+        """
+        if isinstance(move, int):
+            move = move_to_tuple(move)
+        from_pos, to_pos = move[0], move[1]
+        promotion = move[2] if len(move) > 2 else None
+        file, rank = to_pos
+        previous_key = self.zobrist_key
+        # Drop the en passant key while the pawns that justify it are still
+        # on the board; Pawn.move sets a fresh target after a double push
+        self.zobrist_key ^= self._en_passant_hash()
+
+        piece = self._remove_piece(from_pos[0], from_pos[1])
+        captured_pos = to_pos
+        captured_piece = self._remove_piece(file, rank)
+
+        # EN PASSANT: a pawn stepping diagonally onto the skipped square
+        # takes the pawn that sits beside it
+        if (captured_piece is None and to_pos == self.en_passant_target and
+                piece.piece_type == PieceType.PAWN and file != from_pos[0]):
+            captured_pos = (file, from_pos[1])
+            captured_piece = self._remove_piece(file, from_pos[1])
+
+        if captured_piece:
+            captured_piece.delete()
+
+        # Everything pop() needs to restore, in order:
+        # piece, from, to, captured piece and square, piece's has_moved,
+        # en passant target, castling rook record, promoted piece,
+        # castling rights, position key (taken before the pieces moved),
+        # halfmove clock
+        undo = [piece, from_pos, to_pos, captured_piece, captured_pos,
+                getattr(piece, "has_moved", None), self.en_passant_target,
+                None, None, self.castling_rights, previous_key, self.halfmove_clock]
+
+        # Pawn moves and captures reset the fifty-move count
+        if captured_piece or piece.piece_type == PieceType.PAWN:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        self.en_passant_target = None
+        piece.move(to_pos, self)
+
+        # CASTLING
+        if piece.piece_type == PieceType.KING and abs(file - from_pos[0]) == 2:
+            rook_from, rook_to = CASTLING_ROOKS[to_pos]
+            rook = self._remove_piece(rook_from[0], rook_from[1])
+            undo[7] = (rook, rook_from, rook_to, rook.has_moved)
+            rook.move(rook_to, self)
+            self._place_piece(rook, rook_to[0], rook_to[1])
+
+        # PROMOTION
+        if piece.piece_type == PieceType.PAWN and rank in (0, 7):
+            promoted = PROMOTION_CLASSES[promotion or PieceType.QUEEN](piece.color, to_pos)
+            if promoted.piece_type == PieceType.ROOK:
+                promoted.has_moved = True
+            undo[8] = promoted
+            self._place_piece(promoted, file, rank)
+        else:
+            self._place_piece(piece, file, rank)
+
+        rights = (self.castling_rights & CASTLING_MASKS[from_pos[1] * 8 + from_pos[0]] &
+                  CASTLING_MASKS[rank * 8 + file])
+        self.zobrist_key ^= CASTLING_KEYS[self.castling_rights] ^ CASTLING_KEYS[rights]
+        self.castling_rights = rights
+
+        if piece.color == Color.BLACK:
+            self.fullmove_number += 1
+
+        self.active_color = piece.color.opposite()
+        self.zobrist_key ^= SIDE_KEY ^ self._en_passant_hash()
+        self.undo_stack.append(undo)
+        return captured_piece
+
+    def pop(self):
+        """
+        Take back the last move applied with push()
+
+        Returns:
+            The move that was undone as (from_pos, to_pos, promotion)
+        """
+        (piece, from_pos, to_pos, captured_piece, captured_pos, has_moved,
+         en_passant_target, rook_move, promoted,
+         castling_rights, zobrist_key, halfmove_clock) = self.undo_stack.pop()
+
+        self._remove_piece(to_pos[0], to_pos[1])
+
+        if rook_move:
+            rook, rook_from, rook_to, rook_has_moved = rook_move
+            self._remove_piece(rook_to[0], rook_to[1])
+            self._place_piece(rook, rook_from[0], rook_from[1])
+            rook.current_pos = rook_from
+            rook.has_moved = rook_has_moved
+
+        self._place_piece(piece, from_pos[0], from_pos[1])
+        piece.current_pos = from_pos
+        if has_moved is not None:
+            piece.has_moved = has_moved
+
+        if captured_piece:
+            self._place_piece(captured_piece, captured_pos[0], captured_pos[1])
+            captured_piece.current_pos = captured_pos
+
+        self.en_passant_target = en_passant_target
+        self.active_color = piece.color
+        if piece.color == Color.BLACK:
+            self.fullmove_number -= 1
+        self.castling_rights = castling_rights
+        self.zobrist_key = zobrist_key
+        self.halfmove_clock = halfmove_clock
+        return (from_pos, to_pos, promoted.piece_type if promoted else None)
+
+    def step_back(self):
+        """
+        Show the previous position in the move history by undoing a move
+
+        Returns:
+            True if the board moved back, False at the start of the game
+        """
+        if self.current_index <= 0:
+            return False
+
+        self.pop()
+        self.current_index -= 1
+        return True
+
+    def step_forward(self):
+        """
+        Show the next position in the move history by replaying a move
+
+        Returns:
+            True if the board moved forward, False at the latest move
+        """
+        if self.is_curr_pos():
+            return False
+
+        move = self.move_history[self.current_index + 1]
+        self.push((move["From"], move["To"], move["Promotion"]))
+        self.current_index += 1
+        return True
+
     def get_piece(self, piece: Piece):
         """Set the currently selected piece"""
         self.selected_piece = piece
@@ -199,9 +612,9 @@ class Board:
         """Highlight all legal moves for the currently selected piece"""
         # ensure a piece is selected
         if self.selected_piece:
-            legal_moves = self.get_all_legal(self.selected_piece)
-            for move in legal_moves:
-                self.grid[move[1]][move[0]].highlight_move()
+            masks = self.legal_move_masks(self.selected_piece.color)
+            for square in iter_squares(masks.get(self.selected_piece.get_square(), 0)):
+                self.grid[square >> 3][square & 7].highlight_move()
 
     def remove_highlights(self):
         """Remove all highlighted legal moves from the board"""
@@ -222,22 +635,110 @@ class Board:
         Args:
             color: The color of the player
         Returns:
-            List of all possible player move positions
+            array('H') of encoded moves (see _board.move), one entry per
+            from/to pair and one per promotion piece
         """
-        all_moves = []
+        return self.generate_moves(color)
 
-        #Get moves for each piece
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if (piece and piece.color == color):
-                    curr = self.get_all_legal(piece)
+    def generate_moves(self, color: Color = None) -> array:
+        """
+        Build the legal move list for one side as compact 16-bit moves
+
+        Args:
+            color: Side to generate for, the side to move by default
+        Returns:
+            array('H') of encoded moves with capture, en passant, double
+            push, castling and promotion flags set
+        """
+        if color is None:
+            color = self.active_color
+        return array('H', self._encode_moves(color, self.legal_move_masks(color).items()))
+
+    def iter_legal_moves(self, color: Color = None):
+        """
+        Yield legal moves one at a time, generating each piece's targets
+        only when the previous piece's moves are used up. Callers that
+        stop early (first move, any capture, ...) skip the rest of the work.
+
+        Args:
+            color: Side to generate for, the side to move by default
+        Yields:
+            Encoded moves, as in generate_moves
+        """
+        if color is None:
+            color = self.active_color
 
-                    for move in curr:
-                        if move not in all_moves:
-                            all_moves.append(move)
-        
-        return all_moves
+        masks = self.move_cache.peek((self.zobrist_key, color))
+        if masks is not None:
+            yield from self._encode_moves(color, masks.items())
+            return
+
+        context = self.legal_context(color)
+        yield from self._encode_moves(
+            color, ((square, self.legal_move_mask(piece, context))
+                    for square, piece in list(self.piece_lists[color].items())))
+
+    def count_legal_moves(self, color: Color = None) -> int:
+        """
+        Count legal moves without encoding them
+
+        Args:
+            color: Side to count for, the side to move by default
+        Returns:
+            Number of legal moves, each promotion piece counted separately
+        """
+        if color is None:
+            color = self.active_color
+
+        masks = self.legal_move_masks(color)
+        pawns = self.bitboards[color][PieceType.PAWN]
+        last_ranks = 0xFF | (0xFF << 56)
+
+        count = 0
+        for square, targets in masks.items():
+            count += popcount(targets)
+            if pawns >> square & 1:
+                # Three extra moves for each underpromotion choice
+                count += 3 * popcount(targets & last_ranks)
+        return count
+
+    def _encode_moves(self, color: Color, masks):
+        """
+        Turn (from square, target bitboard) pairs into encoded moves
+
+        Args:
+            color: Side the moves belong to
+            masks: Iterable of (square index, legal target bitboard)
+        Yields:
+            Encoded moves with capture, en passant, double push, castling
+            and promotion flags set
+        """
+        pawns = self.bitboards[color][PieceType.PAWN]
+        kings = self.bitboards[color][PieceType.KING]
+        enemies = self.occupancy[color.opposite()]
+        last_ranks = 0xFF | (0xFF << 56)
+
+        for square, targets in masks:
+            bit = 1 << square
+            for target in iter_squares(targets):
+                target_bit = 1 << target
+                flags = CAPTURE if enemies & target_bit else QUIET
+
+                if pawns & bit:
+                    if target_bit & last_ranks:
+                        # Knight, bishop, rook and queen promotions
+                        for code in range(4):
+                            yield (square | (target << 6) |
+                                   ((PROMOTION | flags | code) << 12))
+                        continue
+                    if abs(target - square) == 16:
+                        flags = DOUBLE_PUSH
+                    elif not flags and (target - square) & 7:
+                        flags = EN_PASSANT
+                elif kings & bit and abs(target - square) == 2:
+                    flags = KING_CASTLE if target > square else QUEEN_CASTLE
+
+                yield square | (target << 6) | (flags << 12)
 
     def get_all_enemy_moves(self, color: Color):
         """
@@ -248,20 +749,7 @@ class Board:
         Returns:
             List of all possible enemy move positions
         """
-        all_moves = []
-
-        # Get moves for each piece
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if (piece and piece.color != color):
-                    curr = self.get_all_legal(piece)
-
-                    for move in curr:
-                        if move not in all_moves:
-                            all_moves.append(move)
-
-        return all_moves
+        return self.get_all_moves(color.opposite())
 
     def find_king(self, color: Color):
         """
@@ -272,14 +760,12 @@ class Board:
         Returns:
             Tuple of (file, rank) or None if king not found
         """
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if (piece and piece.color == color and
-                        piece.piece_type.name == "KING"):
-                    return (file, rank)
+        kings = self.bitboards[color][PieceType.KING]
+        if not kings:
+            return None
 
-        return None
+        square = lsb(kings)
+        return (square & 7, square >> 3)
 
     def check_for_checks(self, color: Color):
         """
@@ -290,26 +776,54 @@ class Board:
         Returns:
             True if king is in check, False otherwise
         """
-        # prevent infinite recursion
-        if self.checking_for_checks:
+        king_pos = self.find_king(color)
+        if not king_pos:
             return False
 
-        self.checking_for_checks = True
+        return self.is_square_attacked(king_pos, color.opposite())
 
-        try:
-            king_pos = self.find_king(color)
-            if not king_pos:
-                return False
+    def attackers_to(self, square: int, by_color: Color, occupied: int) -> int:
+        """
+        Find every piece of a color that attacks a square
 
-            enemy_moves = self.get_all_enemy_moves(color)
-            return king_pos in enemy_moves
+        Works outward from the target square: a knight on the square would
+        hit exactly the knights that attack it, and so on for each piece type.
+
+        Args:
+            square: Square index (rank * 8 + file) to test
+            by_color: The color of the attacking pieces
+            occupied: Occupancy to use for slider rays
+        Returns:
+            Bitboard of the attacking pieces
+        """
+        pieces = self.bitboards[by_color]
+        queens = pieces[PieceType.QUEEN]
 
-        finally:
-            self.checking_for_checks = False
+        # A pawn of the defending color on the square sees the attacking pawns
+        return ((PAWN_ATTACKS[by_color.opposite()][square] & pieces[PieceType.PAWN]) |
+                (KNIGHT_ATTACKS[square] & pieces[PieceType.KNIGHT]) |
+                (KING_ATTACKS[square] & pieces[PieceType.KING]) |
+                (rook_attacks(square, occupied) & (pieces[PieceType.ROOK] | queens)) |
+                (bishop_attacks(square, occupied) & (pieces[PieceType.BISHOP] | queens)))
+
+    def is_square_attacked(self, square: tuple[int, int], by_color: Color) -> bool:
+        """
+        Check whether any piece of a color attacks a square
+
+        Args:
+            square: The position to check (file, rank)
+            by_color: The color of the attacking pieces
+        Returns:
+            True if the square is attacked, False otherwise
+        """
+        return self.attackers_to(square[1] * 8 + square[0], by_color, self.occupied) != 0
 
     def check_if_move_into_check(self, piece: Piece, new_pos: tuple[int, int]):
         """
-        Check if moving a piece to a new position would put the king in check
+        Check if moving a piece to a new position would put the king in check.
+        Works on copies of the bitboards, so the grid, the pieces and the
+        position key are never touched and other threads may read the
+        board meanwhile.
 
         Args:
             piece: The piece to move
@@ -317,26 +831,48 @@ class Board:
         Returns:
             True if move would result in check, False otherwise
         """
-        current_pos = piece.current_pos
-        next_pos = self.grid[new_pos[1]][new_pos[0]]
+        from_square = piece.get_square()
+        to_square = new_pos[1] * 8 + new_pos[0]
+        enemy = piece.color.opposite()
+
+        # Squares whose pieces the move takes off the board
+        captured = (1 << to_square) & self.occupancy[enemy]
+        if (piece.piece_type == PieceType.PAWN and not captured and
+                new_pos == self.en_passant_target and new_pos[0] != piece.current_pos[0]):
+            captured = 1 << (piece.current_pos[1] * 8 + new_pos[0])
+
+        occupied = (self.occupied & ~(1 << from_square) & ~captured) | (1 << to_square)
+
+        if piece.piece_type == PieceType.KING:
+            king_square = to_square
+        else:
+            kings = self.bitboards[piece.color][PieceType.KING]
+            if not kings:
+                return False
+            king_square = lsb(kings)
 
-        # Store piece on target tile
-        captured_piece = next_pos.piece_here
+        return self.attackers_to(king_square, enemy, occupied) & ~captured != 0
 
-        # Simulate move
-        self.grid[current_pos[1]][current_pos[0]].piece_here = None
-        next_pos.piece_here = piece
-        piece.current_pos = new_pos
+    def is_legal(self, move) -> bool:
+        """
+        Check whether a move is legal for the side that owns the moving piece,
+        without changing any board state
 
-        # See if moves into check
-        check = self.check_for_checks(piece.color)
+        Args:
+            move: Encoded move, or a tuple of (from_pos, to_pos[, promotion])
+        Returns:
+            True if the move is legal in the current position
+        """
+        if isinstance(move, int):
+            move = move_to_tuple(move)
+        from_pos, to_pos = move[0], move[1]
 
-        # Undo move
-        self.grid[current_pos[1]][current_pos[0]].piece_here = piece
-        next_pos.piece_here = captured_piece
-        piece.current_pos = current_pos
+        piece = self.grid[from_pos[1]][from_pos[0]].piece_here
+        if piece is None:
+            return False
 
-        return check
+        targets = self.legal_move_masks(piece.color).get(piece.get_square(), 0)
+        return bool(targets & (1 << (to_pos[1] * 8 + to_pos[0])))
 
     def get_all_legal(self, piece: Piece):
         """
@@ -347,14 +883,124 @@ class Board:
         Returns:
             List of legal move positions
         """
-        check_moves = piece.get_moves(self)
-        legal_moves = []
+        masks = self.legal_move_masks(piece.color)
+        return squares_to_coords(masks.get(piece.get_square(), 0))
 
-        for move in check_moves:
-            if not self.check_if_move_into_check(piece, move):
-                legal_moves.append(move)
+    def legal_context(self, color: Color):
+        """
+        Work out the check and pin restrictions for one side, once per position
 
-        return legal_moves
+        Args:
+            color: The color of the side to move
+        Returns:
+            Tuple of (king square or None, check mask, pin masks) where the
+            check mask holds the squares that capture or block a single
+            checker (0 under double check) and pin masks maps each pinned
+            piece's square to the line it may still move along
+        """
+        kings = self.bitboards[color][PieceType.KING]
+        if not kings:
+            return (None, FULL_BOARD, {})
+
+        king_square = lsb(kings)
+        enemy_color = color.opposite()
+        enemy = self.bitboards[enemy_color]
+        occupied = self.occupied
+        own = self.occupancy[color]
+
+        checkers = self.attackers_to(king_square, enemy_color, occupied)
+        if not checkers:
+            check_mask = FULL_BOARD
+        elif checkers & (checkers - 1):
+            check_mask = 0
+        else:
+            check_mask = checkers | BETWEEN[king_square][lsb(checkers)]
+
+        # Sliders that would hit the king if our own pieces were transparent
+        enemy_occupied = self.occupancy[enemy_color]
+        queens = enemy[PieceType.QUEEN]
+        snipers = ((rook_attacks(king_square, enemy_occupied) &
+                    (enemy[PieceType.ROOK] | queens)) |
+                   (bishop_attacks(king_square, enemy_occupied) &
+                    (enemy[PieceType.BISHOP] | queens)))
+
+        pins = {}
+        for sniper in iter_squares(snipers):
+            line = BETWEEN[king_square][sniper]
+            blockers = line & occupied
+            # Exactly one blocker, and it is ours: that piece is pinned
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pins[lsb(blockers)] = line | (1 << sniper)
+
+        return (king_square, check_mask, pins)
+
+    def legal_move_mask(self, piece: Piece, context) -> int:
+        """
+        Get the legal target squares of one piece without trying any moves
+
+        Args:
+            piece: The piece to get legal moves for
+            context: Result of legal_context for the piece's color
+        Returns:
+            Bitboard of legal target squares
+        """
+        king_square, check_mask, pins = context
+        square = piece.get_square()
+        targets = piece.get_move_mask(self)
+        enemy_color = piece.color.opposite()
+
+        if square == king_square:
+            # The king may not step onto an attacked square; take it off the
+            # board first so it cannot hide behind itself on a slider ray
+            occupied = self.occupied ^ (1 << square)
+            legal = 0
+            for target in iter_squares(targets):
+                if not self.attackers_to(target, enemy_color, occupied):
+                    legal |= 1 << target
+            return legal
+
+        en_passant = 0
+        if piece.piece_type == PieceType.PAWN and self.en_passant_target:
+            file, rank = self.en_passant_target
+            en_passant = targets & (1 << (rank * 8 + file))
+            targets &= ~en_passant
+
+        targets &= check_mask
+        if square in pins:
+            targets &= pins[square]
+
+        if en_passant and king_square is not None:
+            # Two pawns leave one rank at once, so rebuild the occupancy and
+            # test the king directly rather than trusting the pin/check masks
+            target = lsb(en_passant)
+            captured = 1 << ((square & ~7) | (target & 7))
+            occupied = (self.occupied ^ (1 << square) ^ captured) | en_passant
+            if not self.attackers_to(king_square, enemy_color, occupied) & ~captured:
+                targets |= en_passant
+        elif en_passant:
+            targets |= en_passant
+
+        return targets
+
+    def legal_move_masks(self, color: Color) -> dict[int, int]:
+        """
+        Get the legal target squares of every piece of a color, served from
+        the move cache when this position has been generated before
+
+        Args:
+            color: The color of the pieces
+        Returns:
+            Dict of from-square index to legal target bitboard; shared with
+            the cache, so callers must not modify it
+        """
+        key = (self.zobrist_key, color)
+        masks = self.move_cache.get(key)
+        if masks is None:
+            context = self.legal_context(color)
+            masks = {square: self.legal_move_mask(piece, context)
+                     for square, piece in self.piece_lists[color].items()}
+            self.move_cache.put(key, masks)
+        return masks
 
     def check_if_danger(self, square: tuple[int, int], enemy_moves: list,
                         visited_squares=None):
@@ -386,27 +1032,14 @@ class Board:
         """
         Handle en passant checking and capturing
 
+        push() already takes the passed pawn, so this keeps the position
+        key, move cache and undo stack in step with every other move.
+
         Args:
             piece: The pawn performing en passant
             new_pos: The target position (file, rank)
         """
-        prev_pos = piece.current_pos
-
-        if self.en_passant_target and new_pos == self.en_passant_target:
-
-            if piece.color == Color.WHITE:
-                check_square = (new_pos[0], new_pos[1] - 1)
-            else:
-                check_square = (new_pos[0], new_pos[1] + 1)
-
-            self.grid[check_square[1]][check_square[0]].piece_here = None
-
-        self.grid[prev_pos[1]][prev_pos[0]].piece_here = None
-        self.grid[new_pos[1]][new_pos[0]].piece_here = piece
-        piece.current_pos = new_pos
-        piece.has_moved = True
-
-        self.en_passant_target = None
+        self.push((piece.current_pos, new_pos))
 
     def resign(self, resigning_color: Color):
         """
@@ -429,14 +1062,17 @@ class Board:
             for file in range(8):
                 is_light = (file + rank) % 2 == 1
                 self.grid[rank][file] = Tile(file, rank, is_light)
+        self.clear_bitboards()
 
         # Reset board state
         self.selected_piece = None
-        self.checking_for_checks = False
         self.en_passant_target = None
+        self.active_color = Color.WHITE
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
         self.move_history = []
+        self.undo_stack = []
         self.current_index = -1
-        self.material_differential = 0
         self.checkmate = False
         self.stalemate = False
         self.mate_color = None
@@ -470,7 +1106,9 @@ class Board:
     """
     def board_state(self, active_color: Color = None):
         """
-        Generate FEN (Forsyth-Edwards Notation) string of current _board state
+        Generate FEN (Forsyth-Edwards Notation) string of current _board state.
+        The piece placement field is cached per position key, so repeated
+        calls between moves skip the 64-square walk.
 
         Args:
             active_color: Optional - Whose turn it is (Color.WHITE or Color.BLACK)
@@ -478,40 +1116,22 @@ class Board:
         Returns:
             FEN string representing the _board position
         """
-        fen_string = ""
-        for rank in range(7, -1, -1):  # print rank 8 down to 1
-            fen_row = ""
-            empty_count = 0
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if piece is None:
-                    empty_count += 1
-                    if file == 7:
-                        fen_row = fen_row + str(empty_count)
-                else:
-                    symbol = piece.piece_type.value
-                    if empty_count > 0:
-                        fen_row = fen_row + str(empty_count)
-                        empty_count = 0
-                        if piece.color == Color.WHITE:
-                            fen_row += symbol.upper()
-                        else:
-                            fen_row += symbol.lower()
-                    else:
-                        if piece.color == Color.WHITE:
-                            fen_row += symbol.upper()
-                        else:
-                            fen_row += symbol.lower()
-            fen_string += (fen_row + "/")
-        fen_string = fen_string[:-1]
+        memo_key, fen_string = self.fen_memo
+        if memo_key != self.zobrist_key:
+            fen_string = self._placement_fen()
+            self.fen_memo = (self.zobrist_key, fen_string)
 
         # If active_color provided, return full FEN
         if active_color is not None:
             # Add turn indicator
             turn_char = 'w' if active_color == Color.WHITE else 'b'
 
-            # Add castling rights (simplified for now - could be improved)
-            castling = '-'
+            # Add castling rights
+            castling = ''.join(char for char, right in (('K', WHITE_KINGSIDE),
+                                                        ('Q', WHITE_QUEENSIDE),
+                                                        ('k', BLACK_KINGSIDE),
+                                                        ('q', BLACK_QUEENSIDE))
+                               if self.castling_rights & right) or '-'
 
             # Add en passant target
             if self.en_passant_target:
@@ -521,17 +1141,65 @@ class Board:
             else:
                 en_passant = '-'
 
-            # Add halfmove and fullmove counters (simplified)
-            halfmove = 0
-            fullmove = 1
-
-            fen_string = f"{fen_string} {turn_char} {castling} {en_passant} {halfmove} {fullmove}"
+            fen_string = (f"{fen_string} {turn_char} {castling} {en_passant} "
+                          f"{self.halfmove_clock} {self.fullmove_number}")
 
         return fen_string
 
+    def _placement_fen(self) -> str:
+        """
+        Build the piece placement field of a FEN string
+
+        Returns:
+            Ranks 8 down to 1 separated by '/'
+        """
+        rows = []
+        for rank in range(7, -1, -1):  # rank 8 down to 1
+            row = []
+            empty_count = 0
+            for tile in self.grid[rank]:
+                piece = tile.piece_here
+                if piece is None:
+                    empty_count += 1
+                    continue
+                if empty_count:
+                    row.append(str(empty_count))
+                    empty_count = 0
+                symbol = piece.piece_type.value
+                row.append(symbol.upper() if piece.color == Color.WHITE else symbol.lower())
+            if empty_count:
+                row.append(str(empty_count))
+            rows.append(''.join(row))
+        return '/'.join(rows)
+
+    @property
+    def material_differential(self) -> int:
+        """
+        Material balance kept up to date by _place_piece/_remove_piece
+
+        Returns:
+            Difference in total white material vs total black material
+        """
+        return self.material[Color.WHITE] - self.material[Color.BLACK]
+
+    def evaluate(self) -> int:
+        """
+        Tapered piece-square evaluation, read from running sums that
+        _place_piece/_remove_piece keep current, so it costs a few
+        arithmetic operations per call
+
+        Returns:
+            Score in centipawns from White's point of view
+        """
+        # Extra promoted pieces can push the phase past the opening total
+        phase = min(self.phase, MAX_PHASE)
+        return (self.midgame_score * phase +
+                self.endgame_score * (MAX_PHASE - phase)) // MAX_PHASE
+
     def calculate_material(self):
         '''
-        Calculates the total material balance of the board
+        Calculates the total material balance of the board from scratch;
+        material_differential serves the same number incrementally
 
         Returns:
             Difference in total white material vs total black material
@@ -539,80 +1207,91 @@ class Board:
         white_total = 0
         black_total = 0
 
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-
-                if not piece:
-                    continue
-
-                value = piece.piece_value.value if hasattr(piece.piece_value, "value") else piece.piece_value
-
-                if piece.color == Color.WHITE:
-                    white_total += value
-                else:
-                    black_total += value
+        for piece_type, value in MATERIAL_VALUES.items():
+            white_total += popcount(self.bitboards[Color.WHITE][piece_type]) * value
+            black_total += popcount(self.bitboards[Color.BLACK][piece_type]) * value
 
         return white_total - black_total
 
     def load_fen(self, fen):
         '''
-        Reset the board to the position described by a FEN string
+        Reset the board to the position described by a FEN string.
+        Tiles are reused and pieces already on the board are recycled
+        for matching squares of the new position, so stepping through
+        positions does not rebuild the board.
 
         Args:
-            fen: fen representation of board layout
+            fen: fen representation of board layout; the side to move,
+                 castling, en passant and clock fields are read when present
         '''
-
-        for file in range(8):
-            for rank in range(8):
-
-                #Check if tile is light
-                is_light = (rank + file) % 2 == 1
-
-                #Recreate the tiles
-                self.grid[rank][file] = Tile(file, rank, is_light)
-
-        #Split fen string apart per row
-        rank_rows = fen.split('/')
-
-        #Iterate through ranks and files
-        for rank_index, row in enumerate(reversed(rank_rows)):
-            file_index = 0
-
-            #Find empty squares
-            for char in row:
-                if char.isdigit():
-                    file_index += int(char)
-
-                #If not digit, there is a piece here
+        fields = fen.split()
+
+        # Pool the current pieces by color and class, then empty the tiles
+        spare = {}
+        for piece in self.pieces():
+            spare.setdefault((piece.color, type(piece)), []).append(piece)
+        for row in self.grid:
+            for tile in row:
+                tile.piece_here = None
+                tile.highlighted = tile.prev = tile.clicked = False
+        self.clear_bitboards()
+        self.undo_stack = []
+
+        castling_known = len(fields) > 2
+        if castling_known:
+            self.castling_rights = 0
+            for char, right in (('K', WHITE_KINGSIDE), ('Q', WHITE_QUEENSIDE),
+                                ('k', BLACK_KINGSIDE), ('q', BLACK_QUEENSIDE)):
+                if char in fields[2]:
+                    self.castling_rights |= right
+
+        # Single pass over the placement field, rank 8 first
+        file_index, rank_index = 0, 7
+        for char in fields[0]:
+            if char == '/':
+                file_index, rank_index = 0, rank_index - 1
+            elif char.isdigit():
+                file_index += int(char)
+            else:
+                color = Color.WHITE if char.isupper() else Color.BLACK
+                position = (file_index, rank_index)
+                piece_class = FEN_PIECE_CLASSES[char.lower()]
+                pool = spare.get((color, piece_class))
+                if pool:
+                    piece = pool.pop()
+                    piece.start_pos = piece.current_pos = position
                 else:
-                    color = Color.WHITE if char.isupper() else Color.BLACK
-                    piece_type_char = char.lower()
+                    piece = piece_class(color, position)
 
-                    #Place piece
-                    piece_class = {
-                        'p': Pawn,
-                        'r': Rook,
-                        'n': Knight,
-                        'b': Bishop,
-                        'q': Queen,
-                        'k': King
-                    }[piece_type_char]
+                # Pawns off their start rank have moved; kings and rooks
+                # have moved if the castling field took their rights away
+                if piece_class is Pawn:
+                    piece.has_moved = rank_index != (1 if color == Color.WHITE else 6)
+                elif piece_class is Rook:
+                    right = ROOK_CASTLING_RIGHTS.get(position, 0)
+                    piece.has_moved = castling_known and not self.castling_rights & right
+                elif piece_class is King:
+                    rights = (WHITE_KINGSIDE | WHITE_QUEENSIDE if color == Color.WHITE
+                              else BLACK_KINGSIDE | BLACK_QUEENSIDE)
+                    piece.has_moved = castling_known and not self.castling_rights & rights
 
-                    piece = piece_class(color, (file_index, rank_index))
+                self._place_piece(piece, file_index, rank_index)
+                file_index += 1
 
-                    #Handle has_moved for pawn
-                    if isinstance(piece, Pawn):
-                        if (piece.color == Color.WHITE and rank_index != 1) or (piece.color == Color.BLACK and rank_index != 6):
-                            piece.has_moved = True
+        if len(fields) > 1:
+            self.active_color = Color.WHITE if fields[1] == 'w' else Color.BLACK
 
-                    #TODO - implement has_moved for rook and king as well
+        if not castling_known:
+            self.castling_rights = self.castling_rights_from_placement()
 
-                    self.grid[rank_index][file_index].piece_here = piece
-                    file_index += 1
+        self.en_passant_target = None
+        if len(fields) > 3 and fields[3] != '-':
+            self.en_passant_target = (ord(fields[3][0]) - ord('a'), int(fields[3][1]) - 1)
 
-        #Calculate previous material difference
-        self.material_differential =self.calculate_material()
+        self.halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        self.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+
+        self.zobrist_key = self.compute_zobrist()
 
     def on_mouse_release(self, x: float, y: float, button: int, modifiers: int):
         """Handle mouse release events (placeholder for future implementation)"""
@@ -624,38 +1303,91 @@ class Board:
         """ Check if board displays current move """
         return self.current_index == len(self.move_history) - 1
 
-    def promote(self, color, file, rank):
+    def check_draw(self):
+        """
+        Check to see if enough pieces are left on the board to complete a checkmate; if not, sets draw to true.
         """
-        Create a new instance of a queen wherever a pawn is promoted
+        #Any pawn, rook or queen can still force checkmate
+        for color in Color:
+            counts = self.piece_counts[color]
+            if counts[PieceType.ROOK] or counts[PieceType.QUEEN] or counts[PieceType.PAWN]:
+                return 0
+
+        # A lone bishop or knight per side cannot mate
+        # (bishop + knight or two knights against a bare king still can)
+        for color in Color:
+            counts = self.piece_counts[color]
+            if counts[PieceType.BISHOP] + counts[PieceType.KNIGHT] > 1:
+                return 0
+
+        return 1
+
+    def has_legal_move(self, color: Color) -> bool:
+        """
+        Check whether a color has any legal move, stopping at the first one
 
         Args:
-            Rank: the rank of the pawn/queen
-            File: the file of the pawn/queen
+            color: The color of the pieces
+        Returns:
+            True if at least one legal move exists
         """
-        self.grid[rank][file].piece_here = Queen(color, (file, rank))
+        masks = self.move_cache.peek((self.zobrist_key, color))
+        if masks is not None:
+            return any(masks.values())
+
+        context = self.legal_context(color)
+        for piece in self.piece_lists[color].values():
+            if self.legal_move_mask(piece, context):
+                return True
+        return False
 
-    def check_draw(self):
-        """
-        Check to see if enough pieces are left on the board to complete a checkmate; if not, sets draw to true.
+    def is_repetition(self, count: int = 3) -> bool:
         """
-        piece_count = 0
-
-        #If more than four pieces on the board, checkmate is possible
-        # (bishop/knight and king in each color invalidate checkmate)
-        for rank in range(8):
-            for file in range(8):
-                piece = self.grid[rank][file].piece_here
-                if piece:
+        Check whether the current position has occurred count times
 
-                    piece_count += 1
+        Args:
+            count: Number of occurrences that make a repetition
+        Returns:
+            True if the position has been repeated count times
+        """
+        seen = 1
+        # Only positions since the last pawn move or capture can repeat,
+        # and only every other ply has the same side to move
+        depth = min(self.halfmove_clock, len(self.undo_stack))
+        for ply in range(2, depth + 1, 2):
+            if self.undo_stack[-ply][10] == self.zobrist_key:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
 
-                    if (piece.piece_type == PieceType.ROOK or
-                        piece.piece_type == PieceType.QUEEN or 
-                        piece.piece_type == PieceType.PAWN):
+    def game_status(self) -> GameStatus:
+        """
+        Decide in one pass whether the side to move's game is over
 
-                        return 0
-                
-        if piece_count <= 4:
-            return 1
+        The result is remembered until the position or its history changes.
 
-        
\ No newline at end of file
+        Returns:
+            GameStatus for the side to move
+        """
+        memo_key = (self.zobrist_key, self.halfmove_clock, len(self.undo_stack))
+        if self.status_memo and self.status_memo[0] == memo_key:
+            return self.status_memo[1]
+
+        color = self.active_color
+        if not self.has_legal_move(color):
+            if self.check_for_checks(color):
+                status = GameStatus.CHECKMATE
+            else:
+                status = GameStatus.STALEMATE
+        elif self.check_draw():
+            status = GameStatus.INSUFFICIENT_MATERIAL
+        elif self.halfmove_clock >= 100:
+            status = GameStatus.FIFTY_MOVE
+        elif self.is_repetition():
+            status = GameStatus.REPETITION
+        else:
+            status = GameStatus.ONGOING
+
+        self.status_memo = (memo_key, status)
+        return status
@@ -0,0 +1,26 @@
+"""
+Castling rights bits and the squares that clear them.
+"""
+
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = 15
+
+# King destination -> (rook from, rook to) for each castling move
+CASTLING_ROOKS = {
+    (6, 0): ((7, 0), (5, 0)),
+    (2, 0): ((0, 0), (3, 0)),
+    (6, 7): ((7, 7), (5, 7)),
+    (2, 7): ((0, 7), (3, 7)),
+}
+
+# CASTLING_MASKS[square] -> rights that survive a move from or to that square
+CASTLING_MASKS = [ALL_CASTLING] * 64
+CASTLING_MASKS[4] = ALL_CASTLING & ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASKS[0] = ALL_CASTLING & ~WHITE_QUEENSIDE
+CASTLING_MASKS[7] = ALL_CASTLING & ~WHITE_KINGSIDE
+CASTLING_MASKS[60] = ALL_CASTLING & ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASKS[56] = ALL_CASTLING & ~BLACK_QUEENSIDE
+CASTLING_MASKS[63] = ALL_CASTLING & ~BLACK_KINGSIDE
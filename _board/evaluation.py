@@ -0,0 +1,176 @@
+"""
+Tapered piece-square evaluation tables.
+
+Each piece gets a middlegame and an endgame score (material plus a bonus
+for its square). Board keeps both sums up to date in _place_piece and
+_remove_piece, along with a game phase built from the remaining minor and
+major pieces, and Board.evaluate() blends the two sums by that phase.
+Tables are written from White's side with rank 8 on top, the way a
+diagram reads; Black uses them mirrored.
+"""
+from _enums.color import Color
+from _enums.piece_type import PieceType
+
+MIDGAME_VALUES = {
+    PieceType.PAWN: 82,
+    PieceType.KNIGHT: 337,
+    PieceType.BISHOP: 365,
+    PieceType.ROOK: 477,
+    PieceType.QUEEN: 1025,
+    PieceType.KING: 0,
+}
+
+ENDGAME_VALUES = {
+    PieceType.PAWN: 94,
+    PieceType.KNIGHT: 281,
+    PieceType.BISHOP: 297,
+    PieceType.ROOK: 512,
+    PieceType.QUEEN: 936,
+    PieceType.KING: 0,
+}
+
+# Phase weight of each piece; the opening total is MAX_PHASE
+PHASE_WEIGHTS = {
+    PieceType.PAWN: 0,
+    PieceType.KNIGHT: 1,
+    PieceType.BISHOP: 1,
+    PieceType.ROOK: 2,
+    PieceType.QUEEN: 4,
+    PieceType.KING: 0,
+}
+MAX_PHASE = 24
+
+PAWN_MIDGAME = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+]
+
+PAWN_ENDGAME = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+     80,  80,  80,  80,  80,  80,  80,  80,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     30,  30,  30,  30,  30,  30,  30,  30,
+     15,  15,  15,  15,  15,  15,  15,  15,
+      5,   5,   5,   5,   5,   5,   5,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+]
+
+KNIGHT_TABLE = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+
+BISHOP_TABLE = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+
+ROOK_TABLE = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+]
+
+QUEEN_TABLE = [
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+]
+
+# Shelter behind the pawns while the queens are on
+KING_MIDGAME = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+]
+
+# Head for the centre once the board empties
+KING_ENDGAME = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+]
+
+_MIDGAME_TABLES = {
+    PieceType.PAWN: PAWN_MIDGAME,
+    PieceType.KNIGHT: KNIGHT_TABLE,
+    PieceType.BISHOP: BISHOP_TABLE,
+    PieceType.ROOK: ROOK_TABLE,
+    PieceType.QUEEN: QUEEN_TABLE,
+    PieceType.KING: KING_MIDGAME,
+}
+
+_ENDGAME_TABLES = {
+    PieceType.PAWN: PAWN_ENDGAME,
+    PieceType.KNIGHT: KNIGHT_TABLE,
+    PieceType.BISHOP: BISHOP_TABLE,
+    PieceType.ROOK: ROOK_TABLE,
+    PieceType.QUEEN: QUEEN_TABLE,
+    PieceType.KING: KING_ENDGAME,
+}
+
+
+def _signed_scores(tables: dict, values: dict) -> dict:
+    """
+    Combine material and square bonuses into per-square scores, positive
+    for White and negative for Black
+
+    Args:
+        tables: Piece type -> diagram-ordered square table
+        values: Piece type -> material value
+    Returns:
+        Dict of color -> piece type -> list of 64 scores by square index
+    """
+    scores = {Color.WHITE: {}, Color.BLACK: {}}
+    for piece_type, table in tables.items():
+        value = values[piece_type]
+        # Square index is rank * 8 + file; the diagram lists rank 8 first
+        scores[Color.WHITE][piece_type] = [value + table[(7 - (square >> 3)) * 8 + (square & 7)]
+                                           for square in range(64)]
+        scores[Color.BLACK][piece_type] = [-(value + table[square]) for square in range(64)]
+    return scores
+
+
+# MIDGAME_SCORES[color][piece_type][square] -> signed middlegame score
+MIDGAME_SCORES = _signed_scores(_MIDGAME_TABLES, MIDGAME_VALUES)
+# ENDGAME_SCORES[color][piece_type][square] -> signed endgame score
+ENDGAME_SCORES = _signed_scores(_ENDGAME_TABLES, ENDGAME_VALUES)
@@ -0,0 +1,128 @@
+"""
+Compact 16-bit move encoding.
+
+Bits 0-5 hold the from square, bits 6-11 the to square (rank * 8 + file)
+and bits 12-15 the move flags below. Moves are plain ints, so move lists
+can live in an array('H') without a Python object per move.
+"""
+from array import array
+from _enums.piece_type import PieceType
+
+QUIET = 0
+DOUBLE_PUSH = 1
+KING_CASTLE = 2
+QUEEN_CASTLE = 3
+CAPTURE = 4
+EN_PASSANT = 5
+# Promotion flag; the low two flag bits pick the piece and CAPTURE may be set
+PROMOTION = 8
+
+PROMOTION_PIECES = [PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN]
+PROMOTION_CODES = {piece_type: code for code, piece_type in enumerate(PROMOTION_PIECES)}
+
+NULL_MOVE = 0
+
+
+def encode_move(from_square: int, to_square: int, flags: int = QUIET) -> int:
+    """
+    Pack a move into 16 bits
+
+    Args:
+        from_square: Square index the piece leaves
+        to_square: Square index the piece lands on
+        flags: Move flags (QUIET, CAPTURE, PROMOTION | code, ...)
+    Returns:
+        Encoded move
+    """
+    return from_square | (to_square << 6) | (flags << 12)
+
+
+def move_from(move: int) -> int:
+    """ Square index a move starts from """
+    return move & 63
+
+
+def move_to(move: int) -> int:
+    """ Square index a move lands on """
+    return (move >> 6) & 63
+
+
+def move_flags(move: int) -> int:
+    """ Flag bits of a move """
+    return move >> 12
+
+
+def is_capture(move: int) -> bool:
+    """ Determine if a move takes a piece (en passant included) """
+    return bool(move & (CAPTURE << 12))
+
+
+def move_promotion(move: int):
+    """
+    Piece type a move promotes to
+
+    Args:
+        move: Encoded move
+    Returns:
+        PieceType of the new piece, or None if the move is not a promotion
+    """
+    flags = move >> 12
+    if flags & PROMOTION:
+        return PROMOTION_PIECES[flags & 3]
+    return None
+
+
+def move_to_tuple(move: int):
+    """
+    Convert an encoded move to the board's coordinate form
+
+    Args:
+        move: Encoded move
+    Returns:
+        Tuple of (from_pos, to_pos, promotion) with positions as (file, rank)
+    """
+    from_square = move & 63
+    to_square = (move >> 6) & 63
+    return ((from_square & 7, from_square >> 3), (to_square & 7, to_square >> 3),
+            move_promotion(move))
+
+
+def move_to_uci(move: int) -> str:
+    """
+    Format a move in UCI long algebraic notation
+
+    Args:
+        move: Encoded move
+    Returns:
+        Move string such as "e2e4" or "e7e8q"
+    """
+    from_square = move & 63
+    to_square = (move >> 6) & 63
+    text = (f"{chr(ord('a') + (from_square & 7))}{(from_square >> 3) + 1}"
+            f"{chr(ord('a') + (to_square & 7))}{(to_square >> 3) + 1}")
+    promotion = move_promotion(move)
+    if promotion:
+        text += promotion.value.lower()
+    return text
+
+
+def find_uci_move(moves: array, text: str):
+    """
+    Look up a UCI move string in a move list
+
+    Args:
+        moves: Legal moves as produced by Board.get_all_moves
+        text: Move string such as "e2e4" or "e7e8q"
+    Returns:
+        The matching encoded move, or None if it is not in the list
+    """
+    from_square = (int(text[1]) - 1) * 8 + ord(text[0]) - ord('a')
+    to_square = (int(text[3]) - 1) * 8 + ord(text[2]) - ord('a')
+    promotion = text[4].upper() if len(text) > 4 else None
+
+    for move in moves:
+        if move & 63 == from_square and (move >> 6) & 63 == to_square:
+            piece_type = move_promotion(move)
+            if piece_type is None or piece_type.value == promotion:
+                return move
+    return None
@@ -0,0 +1,107 @@
+"""
+Size-bounded LRU cache for per-position move generation results.
+"""
+import threading
+from collections import OrderedDict
+
+
+class MoveCache:
+    """
+    Maps a position key to its generated moves, evicting the least
+    recently used entry once max_size is reached. A lock guards every
+    access, so boards read from several threads can share one cache.
+
+    Attributes:
+        max_size: Maximum number of positions kept
+        hits: Number of lookups answered from the cache
+        misses: Number of lookups that had to be generated
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        """
+        Initialize an empty cache
+
+        Args:
+            max_size: Maximum number of positions kept
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Number of cached positions
+
+        Returns:
+            Count of entries currently held
+        """
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Look up a position and mark it as recently used
+
+        Args:
+            key: Position key
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key):
+        """
+        Look up a position without touching the counters or recency
+
+        Args:
+            key: Position key
+        Returns:
+            The cached value, or None if absent
+        """
+        with self.lock:
+            return self.entries.get(key)
+
+    def put(self, key, value):
+        """
+        Store a position's moves, evicting the oldest entry if full
+
+        Args:
+            key: Position key
+            value: Generated moves for that position
+        """
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Summarize cache effectiveness
+
+        Returns:
+            Dict with size, hits, misses and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
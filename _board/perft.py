@@ -0,0 +1,206 @@
+"""
+Perft: count the leaf nodes of the legal move tree to check and time
+Board's move generator.
+
+Usage:
+    python -m _board.perft --fen "<fen>" --depth 3 --divide
+    python -m _board.perft --fen "<fen>" --depth 5 --jobs 8
+    python -m _board.perft --suite
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from _board.board import Board
+from _board.move import move_to_uci
+from _board.position import Position
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# (name, fen, node counts for depth 1, 2, 3, ...)
+REFERENCE_POSITIONS = [
+    ("start position", START_FEN,
+     [20, 400, 8902, 197281]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862]),
+    ("en passant pins", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238]),
+    ("promotions and castling", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467]),
+    ("discovered checks", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379]),
+    ("symmetrical middlegame",
+     "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890]),
+]
+
+
+def perft(board: Board, depth: int) -> int:
+    """
+    Count the leaf nodes of the legal move tree
+
+    Args:
+        board: The board to search; restored before returning
+        depth: Number of plies to expand
+    Returns:
+        Number of positions at the given depth
+    """
+    if depth == 0:
+        return 1
+
+    if depth == 1:
+        return board.count_legal_moves()
+
+    nodes = 0
+    for move in board.generate_moves():
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+
+def divide(board: Board, depth: int) -> dict[str, int]:
+    """
+    Count leaf nodes below each root move
+
+    Args:
+        board: The board to search; restored before returning
+        depth: Number of plies to expand, root move included
+    Returns:
+        Dict of UCI move string to node count
+    """
+    counts = {}
+    for move in board.generate_moves():
+        board.push(move)
+        counts[move_to_uci(move)] = perft(board, depth - 1)
+        board.pop()
+    return counts
+
+
+def _perft_root_move(position: Position, move: int, depth: int) -> int:
+    """
+    Count the leaf nodes below one root move; runs in a worker process
+
+    Args:
+        position: Snapshot of the root position
+        move: Encoded root move
+        depth: Number of plies to expand, root move included
+    Returns:
+        Number of positions at the given depth
+    """
+    board = Board.from_position(position)
+    board.push(move)
+    return perft(board, depth - 1)
+
+
+def parallel_divide(board: Board, depth: int, jobs: int) -> dict[str, int]:
+    """
+    Count leaf nodes below each root move, spreading the root moves over
+    worker processes that rebuild the position from a snapshot
+
+    Args:
+        board: The board to search; not modified
+        depth: Number of plies to expand, root move included
+        jobs: Number of worker processes
+    Returns:
+        Dict of UCI move string to node count, in move generation order
+        however the work was scheduled
+    """
+    moves = list(board.generate_moves())
+    if jobs <= 1 or depth <= 1 or len(moves) <= 1:
+        return divide(board, depth)
+
+    position = board.snapshot()
+    with ProcessPoolExecutor(max_workers=min(jobs, len(moves))) as pool:
+        counts = pool.map(_perft_root_move, [position] * len(moves), moves,
+                          [depth] * len(moves))
+        return {move_to_uci(move): nodes for move, nodes in zip(moves, counts)}
+
+
+def board_from_fen(fen: str) -> Board:
+    """
+    Build a board set up from a full FEN string
+
+    Args:
+        fen: FEN string including side to move, castling and en passant
+    Returns:
+        A Board in that position
+    """
+    board = Board()
+    board.load_fen(fen)
+    return board
+
+
+def run_suite(max_nodes: int, jobs: int = 1) -> bool:
+    """
+    Run perft on the reference positions and compare with known counts
+
+    Args:
+        max_nodes: Skip depths whose expected count exceeds this
+        jobs: Number of worker processes
+    Returns:
+        True if every checked count matched
+    """
+    all_passed = True
+    total_nodes = 0
+    start = time.perf_counter()
+
+    for name, fen, expected_counts in REFERENCE_POSITIONS:
+        board = board_from_fen(fen)
+        for depth, expected in enumerate(expected_counts, start=1):
+            if expected > max_nodes:
+                break
+            if jobs > 1:
+                nodes = sum(parallel_divide(board, depth, jobs).values())
+            else:
+                nodes = perft(board, depth)
+            total_nodes += nodes
+            status = "ok" if nodes == expected else f"FAIL (expected {expected})"
+            all_passed = all_passed and nodes == expected
+            print(f"{name:<24} depth {depth}: {nodes:>8} {status}")
+
+    elapsed = time.perf_counter() - start
+    print(f"{total_nodes} nodes in {elapsed:.2f}s ({total_nodes / elapsed:,.0f} nps)")
+    return all_passed
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Count move generation leaf nodes")
+    parser.add_argument("--fen", default=START_FEN, help="position to search")
+    parser.add_argument("--depth", type=int, default=3, help="plies to expand")
+    parser.add_argument("--divide", action="store_true",
+                        help="print the node count below each root move")
+    parser.add_argument("--suite", action="store_true",
+                        help="check the reference positions instead of --fen")
+    parser.add_argument("--max-nodes", type=int, default=100000,
+                        help="largest reference count --suite will run")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="worker processes to split the root moves over, 0 for one per core")
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+
+    if args.suite:
+        raise SystemExit(0 if run_suite(args.max_nodes, jobs) else 1)
+
+    board = board_from_fen(args.fen)
+    start = time.perf_counter()
+
+    if args.divide:
+        counts = parallel_divide(board, args.depth, jobs)
+        for move, nodes in sorted(counts.items()):
+            print(f"{move}: {nodes}")
+        total = sum(counts.values())
+        print(f"\nMoves: {len(counts)}")
+    elif jobs > 1:
+        total = sum(parallel_divide(board, args.depth, jobs).values())
+    else:
+        total = perft(board, args.depth)
+
+    elapsed = time.perf_counter() - start
+    print(f"Nodes: {total}")
+    print(f"Time: {elapsed:.3f}s ({total / elapsed if elapsed else 0:,.0f} nps)")
+
+
+if __name__ == "__main__":
+    main()
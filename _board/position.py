@@ -0,0 +1,85 @@
+"""
+Immutable position snapshots that can be hashed, compared and pickled.
+"""
+from dataclasses import dataclass
+from typing import Optional
+from _enums.color import Color
+from _board.castling import BLACK_KINGSIDE, BLACK_QUEENSIDE, WHITE_KINGSIDE, WHITE_QUEENSIDE
+
+# Piece letter used for every square of a snapshot that holds no piece
+EMPTY_SQUARE = '.'
+
+
+@dataclass(frozen=True, slots=True)
+class Position:
+    """
+    A frozen copy of everything needed to rebuild a board position.
+    It holds only strings, ints and enum members, so it can be used as a
+    dict key and sent to worker processes without dragging tiles and
+    piece objects along.
+
+    Attributes:
+        placement: 64 FEN piece letters, square a1 first, '.' for empty
+        active_color: The side to move
+        castling_rights: Castling rights bitmask (see _board.castling)
+        en_passant_target: Skipped square of the last double push, or None
+        halfmove_clock: Plies since the last pawn move or capture
+        fullmove_number: Move number, starting at 1
+    """
+    placement: str
+    active_color: Color
+    castling_rights: int
+    en_passant_target: Optional[tuple[int, int]] = None
+    halfmove_clock: int = 0
+    fullmove_number: int = 1
+
+    def piece_letter(self, file: int, rank: int) -> Optional[str]:
+        """
+        Get the FEN letter of the piece on a square
+
+        Args:
+            file: The file (column) position (0-7)
+            rank: The rank (row) position (0-7)
+        Returns:
+            Uppercase letter for white, lowercase for black, None if empty
+        """
+        letter = self.placement[rank * 8 + file]
+        return None if letter == EMPTY_SQUARE else letter
+
+    def to_fen(self) -> str:
+        """
+        Format the snapshot as a full FEN string
+
+        Returns:
+            FEN string with all six fields
+        """
+        rows = []
+        for rank in range(7, -1, -1):
+            row = []
+            empty_count = 0
+            for letter in self.placement[rank * 8:rank * 8 + 8]:
+                if letter == EMPTY_SQUARE:
+                    empty_count += 1
+                    continue
+                if empty_count:
+                    row.append(str(empty_count))
+                    empty_count = 0
+                row.append(letter)
+            if empty_count:
+                row.append(str(empty_count))
+            rows.append(''.join(row))
+
+        castling = ''.join(char for char, right in (('K', WHITE_KINGSIDE),
+                                                    ('Q', WHITE_QUEENSIDE),
+                                                    ('k', BLACK_KINGSIDE),
+                                                    ('q', BLACK_QUEENSIDE))
+                           if self.castling_rights & right) or '-'
+        if self.en_passant_target:
+            file, rank = self.en_passant_target
+            en_passant = f"{chr(ord('a') + file)}{rank + 1}"
+        else:
+            en_passant = '-'
+        turn_char = 'w' if self.active_color == Color.WHITE else 'b'
+
+        return (f"{'/'.join(rows)} {turn_char} {castling} {en_passant} "
+                f"{self.halfmove_clock} {self.fullmove_number}")
@@ -0,0 +1,569 @@
+"""
+Endgame tablebases built by retrograde analysis.
+
+A table covers one material set, named like "KQK": the white pieces, then
+the black ones. It stores one byte per (placement, side to move):
+
+    0       draw
+    odd v   the side to move is mated in v - 1 plies (1 = checkmated now)
+    even v  the side to move mates in v - 1 plies
+    255     not a legal position
+
+The byte for pieces on squares s0, s1, ... (in the table's piece order)
+with side to move stm (0 white, 1 black) sits at offset
+(((s0 * 64 + s1) * 64 + s2) ...) * 2 + stm, so a table is a flat file
+that can be mapped and probed without loading it. Tables assume no
+castling rights; positions with the colors swapped are probed by
+mirroring the board.
+
+Generation uses the same attack tables as Board, works on square tuples
+instead of Board objects so it stays fast enough in Python, and needs
+the tables its promotions lead into (KQK and KRK before KPK).
+
+Usage:
+    python -m _board.tablebase KQK KRK KPK KBNK
+"""
+import argparse
+import mmap
+import os
+import time
+from array import array
+from collections import defaultdict
+from itertools import product
+from typing import Optional
+from _board.attacks import (KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, bishop_attacks,
+                            pawn_pushes, queen_attacks, rook_attacks)
+from _board.board import Board
+from _enums.color import Color
+from _enums.piece_type import PieceType
+
+DRAW = 0
+INVALID = 255
+
+DEFAULT_DIRECTORY = "_assets/tablebases"
+TABLE_EXTENSION = ".tb"
+
+# Order of the non-king pieces within a table name
+NAME_ORDER = [PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP, PieceType.KNIGHT,
+              PieceType.PAWN]
+
+PIECE_LETTERS = {piece_type.value: piece_type for piece_type in PieceType}
+
+COLORS = (Color.WHITE, Color.BLACK)
+
+
+def parse_table_name(name: str) -> list[tuple[Color, PieceType]]:
+    """
+    Split a table name into its pieces
+
+    Args:
+        name: Table name such as "KBNK"
+    Returns:
+        List of (color, piece type) in table order, white king first
+    """
+    black_king = name.index('K', 1)
+    pieces = [(Color.WHITE, PIECE_LETTERS[letter]) for letter in name[:black_king]]
+    pieces += [(Color.BLACK, PIECE_LETTERS[letter]) for letter in name[black_king:]]
+    return pieces
+
+
+def table_name(pieces: list[tuple[Color, PieceType]]) -> str:
+    """
+    Build the canonical name of a material set
+
+    Args:
+        pieces: (color, piece type) of every piece on the board
+    Returns:
+        Table name such as "KQK"
+    """
+    name = ""
+    for color in COLORS:
+        types = [piece_type for piece_color, piece_type in pieces if piece_color == color]
+        name += "K" + "".join(piece_type.value for piece_type in NAME_ORDER
+                              for _ in range(types.count(piece_type)))
+    return name
+
+
+def is_insufficient(pieces: list[tuple[Color, PieceType]]) -> bool:
+    """
+    Check whether a material set can never mate (same rule as Board.check_draw)
+
+    Args:
+        pieces: (color, piece type) of every piece
+    Returns:
+        True if neither side can mate
+    """
+    for color in COLORS:
+        types = [piece_type for piece_color, piece_type in pieces
+                 if piece_color == color and piece_type != PieceType.KING]
+        if any(piece_type in (PieceType.PAWN, PieceType.ROOK, PieceType.QUEEN)
+               for piece_type in types) or len(types) > 1:
+            return False
+    return True
+
+
+def _attacks(color: Color, piece_type: PieceType, square: int, occupied: int) -> int:
+    """ Squares a piece attacks """
+    if piece_type == PieceType.KING:
+        return KING_ATTACKS[square]
+    if piece_type == PieceType.KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    if piece_type == PieceType.BISHOP:
+        return bishop_attacks(square, occupied)
+    if piece_type == PieceType.ROOK:
+        return rook_attacks(square, occupied)
+    if piece_type == PieceType.QUEEN:
+        return queen_attacks(square, occupied)
+    return PAWN_ATTACKS[color][square]
+
+
+class TableGenerator:
+    """
+    Retrograde solver for one material set
+
+    Attributes:
+        name: Table name
+        pieces: (color, piece type) in table order
+        values: Result byte per index, filled by generate()
+    """
+
+    def __init__(self, name: str, probe_other=None) -> None:
+        """
+        Set up a generator
+
+        Args:
+            name: Table name such as "KQK"
+            probe_other: Callable(pieces, squares, stm) -> result byte for
+                         positions reached by a capture or promotion that
+                         are not a dead draw; usually Tablebase.probe_squares
+        """
+        self.name = name
+        self.pieces = parse_table_name(name)
+        self.count = len(self.pieces)
+        self.probe_other = probe_other
+        self.values = bytearray(64 ** self.count * 2)
+        self.king_slots = {color: self.pieces.index((color, PieceType.KING)) for color in COLORS}
+
+    def index(self, squares, stm: int) -> int:
+        """ Table offset of a placement and side to move """
+        index = 0
+        for square in squares:
+            index = index * 64 + square
+        return index * 2 + stm
+
+    def squares_of(self, index: int) -> tuple[tuple[int, ...], int]:
+        """ Placement and side to move stored at a table offset """
+        stm = index & 1
+        index >>= 1
+        squares = []
+        for _ in range(self.count):
+            index, square = divmod(index, 64)
+            squares.append(square)
+        return tuple(reversed(squares)), stm
+
+    def _attacked(self, squares, square: int, by_color: Color, occupied: int,
+                  skip: int = -1) -> bool:
+        """ Check whether a square is attacked by one side's pieces """
+        for slot, (color, piece_type) in enumerate(self.pieces):
+            if color == by_color and slot != skip and squares[slot] >= 0:
+                if _attacks(color, piece_type, squares[slot], occupied) >> square & 1:
+                    return True
+        return False
+
+    def _valid(self, squares, stm: int) -> bool:
+        """ Check that a placement can occur with stm to move """
+        if len(set(squares)) < self.count:
+            return False
+        for slot, (_, piece_type) in enumerate(self.pieces):
+            if piece_type == PieceType.PAWN and squares[slot] >> 3 in (0, 7):
+                return False
+        waiting = COLORS[1 - stm]
+        occupied = 0
+        for square in squares:
+            occupied |= 1 << square
+        # The side that just moved cannot have left its king in check
+        return not self._attacked(squares, squares[self.king_slots[waiting]],
+                                  COLORS[stm], occupied)
+
+    def _moves(self, squares, stm: int):
+        """
+        Generate the legal moves of a position
+
+        Yields:
+            (True, child index) for moves that stay in this table and
+            (False, child result byte) for captures and promotions
+        """
+        color = COLORS[stm]
+        enemy = COLORS[1 - stm]
+        occupied = own = 0
+        for slot, square in enumerate(squares):
+            occupied |= 1 << square
+            if self.pieces[slot][0] == color:
+                own |= 1 << square
+        king_slot = self.king_slots[color]
+
+        for slot, (piece_color, piece_type) in enumerate(self.pieces):
+            if piece_color != color:
+                continue
+            square = squares[slot]
+            if piece_type == PieceType.PAWN:
+                targets = (pawn_pushes(square, color, occupied) |
+                           (PAWN_ATTACKS[color][square] & occupied & ~own))
+            else:
+                targets = _attacks(color, piece_type, square, occupied) & ~own
+
+            while targets:
+                low_bit = targets & -targets
+                targets ^= low_bit
+                target = low_bit.bit_length() - 1
+
+                moved = list(squares)
+                moved[slot] = target
+                captured = -1
+                if occupied & low_bit:
+                    captured = squares.index(target)
+                    moved[captured] = -1
+                new_occupied = (occupied & ~(1 << square)) | low_bit
+                if self._attacked(moved, moved[king_slot], enemy, new_occupied, captured):
+                    continue
+
+                promotes = piece_type == PieceType.PAWN and target >> 3 in (0, 7)
+                if captured < 0 and not promotes:
+                    yield True, self.index(moved, 1 - stm)
+                    continue
+
+                pieces = [(c, t) for index, (c, t) in enumerate(self.pieces) if index != captured]
+                child = [s for s in moved if s >= 0]
+                for promotion in ((PieceType.QUEEN, PieceType.ROOK, PieceType.BISHOP,
+                                   PieceType.KNIGHT) if promotes else (None,)):
+                    if promotion:
+                        pieces = [(c, promotion) if index == slot else (c, t)
+                                  for index, (c, t) in enumerate(self.pieces)
+                                  if index != captured]
+                    if is_insufficient(pieces):
+                        yield False, DRAW
+                    else:
+                        yield False, self.probe_other(pieces, child, 1 - stm)
+
+    def _unmoves(self, squares, stm: int):
+        """
+        Generate the positions that lead here by one non-capturing,
+        non-promoting move of the side that is not to move
+
+        Yields:
+            Table index of each predecessor
+        """
+        mover = COLORS[1 - stm]
+        occupied = 0
+        for square in squares:
+            occupied |= 1 << square
+
+        for slot, (color, piece_type) in enumerate(self.pieces):
+            if color != mover:
+                continue
+            square = squares[slot]
+            if piece_type == PieceType.PAWN:
+                step = -8 if color == Color.WHITE else 8
+                origins = 0
+                single = square + step
+                if 8 <= single < 56 and not occupied >> single & 1:
+                    origins |= 1 << single
+                    double = single + step
+                    start_rank = 1 if color == Color.WHITE else 6
+                    if double >> 3 == start_rank and not occupied >> double & 1:
+                        origins |= 1 << double
+            else:
+                # Piece moves are reversible, so origins are the empty
+                # squares the piece attacks from where it stands
+                origins = _attacks(color, piece_type, square, occupied) & ~occupied
+
+            while origins:
+                low_bit = origins & -origins
+                origins ^= low_bit
+                moved = list(squares)
+                moved[slot] = low_bit.bit_length() - 1
+                yield self.index(moved, 1 - stm)
+
+    def generate(self, verbose: bool = False) -> bytearray:
+        """
+        Solve every position of the table
+
+        Args:
+            verbose: Print progress
+        Returns:
+            The result bytes, also kept in self.values
+        """
+        start = time.perf_counter()
+        values = self.values
+        size = len(values)
+        counters = array('B', bytes(size))
+        escapes = bytearray(size)
+        exit_losses = bytearray(size)
+        # Positions waiting to be resolved, by result byte
+        buckets = defaultdict(lambda: array('I'))
+        # Report progress every eighth of the placements
+        report_every = 64 ** self.count // 8
+
+        for placement, squares in enumerate(product(range(64), repeat=self.count)):
+            if verbose and placement and not placement % report_every:
+                print(f"{self.name}: setting up {placement * 100 // 64 ** self.count}%, "
+                      f"{time.perf_counter() - start:.0f}s", flush=True)
+            for stm in (0, 1):
+                index = self.index(squares, stm)
+                if not self._valid(squares, stm):
+                    values[index] = INVALID
+                    continue
+
+                has_move = False
+                best_exit = None
+                for in_table, result in self._moves(squares, stm):
+                    has_move = True
+                    if in_table:
+                        counters[index] += 1
+                    elif result == DRAW:
+                        escapes[index] = 1
+                    elif result & 1:
+                        # The opponent is mated after this exit
+                        escapes[index] = 1
+                        if best_exit is None or result + 1 < best_exit:
+                            best_exit = result + 1
+                    else:
+                        exit_losses[index] = max(exit_losses[index], result)
+
+                if not has_move:
+                    king = squares[self.king_slots[COLORS[stm]]]
+                    occupied = sum(1 << square for square in squares)
+                    if self._attacked(squares, king, COLORS[1 - stm], occupied):
+                        buckets[1].append(index)
+                    continue
+                if best_exit is not None:
+                    buckets[best_exit].append(index)
+                elif not counters[index] and not escapes[index]:
+                    buckets[exit_losses[index] + 1].append(index)
+
+        if verbose:
+            print(f"{self.name}: positions set up in {time.perf_counter() - start:.1f}s",
+                  flush=True)
+
+        level = 1
+        while buckets:
+            pending = buckets.pop(level, ())
+            for index in pending:
+                if values[index]:
+                    continue
+                values[index] = level
+                squares, stm = self.squares_of(index)
+                for parent in self._unmoves(squares, stm):
+                    if values[parent]:
+                        continue
+                    if level & 1:
+                        buckets[level + 1].append(parent)
+                    else:
+                        counters[parent] -= 1
+                        if not counters[parent] and not escapes[parent]:
+                            buckets[max(level, exit_losses[parent]) + 1].append(parent)
+            if verbose and pending and not level % 8:
+                print(f"{self.name}: resolved mates up to {level - 1} plies, "
+                      f"{time.perf_counter() - start:.0f}s", flush=True)
+            level += 1
+            if level >= INVALID:
+                raise ValueError(f"{self.name}: distance to mate does not fit in a byte")
+
+        if verbose:
+            decided = [value for value in values if value not in (DRAW, INVALID)]
+            print(f"{self.name}: {len(decided)} decided positions, longest mate "
+                  f"{max(decided, default=1) - 1} plies, {time.perf_counter() - start:.1f}s",
+                  flush=True)
+        return values
+
+    def write(self, directory: str = DEFAULT_DIRECTORY) -> str:
+        """
+        Save the table
+
+        Args:
+            directory: Folder for table files
+        Returns:
+            Path of the written file
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.name + TABLE_EXTENSION)
+        with open(path, "wb") as table_file:
+            table_file.write(self.values)
+        return path
+
+
+class Tablebase:
+    """
+    Probes table files from a directory, mapping each file on first use
+
+    Attributes:
+        directory: Folder holding the table files
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY) -> None:
+        """
+        Open a tablebase directory
+
+        Args:
+            directory: Folder holding the table files
+        """
+        self.directory = directory
+        self.tables = {}
+
+    def available(self) -> list[str]:
+        """
+        List the tables present on disk
+
+        Returns:
+            Table names
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(file[:-len(TABLE_EXTENSION)] for file in os.listdir(self.directory)
+                      if file.endswith(TABLE_EXTENSION))
+
+    def _table(self, name: str):
+        """ Map a table file, None if it does not exist """
+        if name not in self.tables:
+            path = os.path.join(self.directory, name + TABLE_EXTENSION)
+            if not os.path.exists(path):
+                self.tables[name] = None
+            else:
+                with open(path, "rb") as table_file:
+                    self.tables[name] = mmap.mmap(table_file.fileno(), 0,
+                                                  access=mmap.ACCESS_READ)
+        return self.tables[name]
+
+    def close(self):
+        """ Unmap every open table """
+        for table in self.tables.values():
+            if table is not None:
+                table.close()
+        self.tables.clear()
+
+    def probe_squares(self, pieces: list[tuple[Color, PieceType]], squares, stm: int) -> int:
+        """
+        Look up a position given as pieces and squares
+
+        Args:
+            pieces: (color, piece type) of each piece, any order
+            squares: Square index of each piece
+            stm: 0 if White is to move, 1 if Black
+        Returns:
+            Result byte (see module docstring)
+        Raises:
+            KeyError: If no table covers the material
+        """
+        name = table_name(pieces)
+        table = self._table(name)
+        if table is None:
+            # Same material with the colors swapped: flip the board
+            swapped = [(COLORS[color == Color.WHITE], piece_type) for color, piece_type in pieces]
+            name = table_name(swapped)
+            table = self._table(name)
+            if table is None:
+                raise KeyError(f"No tablebase for {table_name(pieces)}")
+            pieces = swapped
+            squares = [square ^ 56 for square in squares]
+            stm ^= 1
+
+        placed = dict(zip(pieces, squares)) if len(set(pieces)) == len(pieces) else None
+        if placed is None:
+            raise KeyError(f"Tables with repeated pieces are not supported: {name}")
+
+        index = 0
+        for piece in parse_table_name(name):
+            index = index * 64 + placed[piece]
+        return table[index * 2 + stm]
+
+    def probe(self, board: Board) -> Optional[int]:
+        """
+        Look up a board position
+
+        Args:
+            board: The position
+        Returns:
+            Result byte (see module docstring), or None if no table
+            covers the position
+        """
+        if board.castling_rights:
+            return None
+        pieces, squares = [], []
+        for color in COLORS:
+            for square, piece in board.piece_lists[color].items():
+                pieces.append((color, piece.piece_type))
+                squares.append(square)
+        if len(pieces) > 5:
+            return None
+        try:
+            value = self.probe_squares(pieces, squares, int(board.active_color == Color.BLACK))
+        except KeyError:
+            return None
+        return None if value == INVALID else value
+
+    def best_move(self, board: Board) -> Optional[int]:
+        """
+        Pick the move that keeps the best result: the fastest mate when
+        winning, the longest defence when losing, any drawing move otherwise
+
+        Args:
+            board: The position; restored before returning
+        Returns:
+            Encoded move, or None if the position is not in the tables
+        """
+        value = self.probe(board)
+        if value is None:
+            return None
+
+        best_move, best_rank = None, None
+        for move in board.generate_moves():
+            board.push(move)
+            child = self.probe(board)
+            if child is None:
+                child = DRAW if board.check_draw() else None
+            board.pop()
+            if child is None:
+                continue
+            # Rank children from the mover's point of view: mating the
+            # opponent soonest first, then draws, then the slowest loss
+            if child & 1:
+                rank = (2, -child)
+            elif child == DRAW:
+                rank = (1, 0)
+            else:
+                rank = (0, child)
+            if best_rank is None or rank > best_rank:
+                best_move, best_rank = move, rank
+        return best_move
+
+
+def generate(names: list[str], directory: str = DEFAULT_DIRECTORY, verbose: bool = True):
+    """
+    Generate and save tables, in the order given
+
+    Args:
+        names: Table names; list promotion targets before pawn tables
+        directory: Folder for table files
+        verbose: Print progress
+    """
+    tablebase = Tablebase(directory)
+    for name in names:
+        generator = TableGenerator(name, tablebase.probe_squares)
+        generator.generate(verbose)
+        path = generator.write(directory)
+        if verbose:
+            print(f"{name}: wrote {path}")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate endgame tablebases")
+    parser.add_argument("tables", nargs="*", default=["KQK", "KRK", "KPK"],
+                        help="tables to build, promotion targets first")
+    parser.add_argument("--dir", default=DEFAULT_DIRECTORY, help="output directory")
+    args = parser.parse_args()
+    generate(args.tables, args.dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ from typing import Optional
 from _pieces.piece import Piece
 from _enums.color import Color
 
-@dataclass()
+@dataclass(slots=True)
 class Tile:
     """
     A single tile/square on the chess board
@@ -0,0 +1,25 @@
+"""
+Zobrist keys for hashing board positions into a 64-bit integer.
+
+A position's key is the XOR of one key per (color, piece type, square),
+the side key when black is to move, the key of the current castling
+rights and, when a capture is actually possible, the en passant file.
+The keys come from a fixed seed so they are identical in every process.
+"""
+import random
+from _enums.color import Color
+from _enums.piece_type import PieceType
+
+_generator = random.Random(0x3050C4E55)
+
+# PIECE_KEYS[color][piece_type][square]
+PIECE_KEYS = {color: {piece_type: [_generator.getrandbits(64) for _ in range(64)]
+                      for piece_type in PieceType}
+              for color in Color}
+
+SIDE_KEY = _generator.getrandbits(64)
+
+# Indexed by the 4-bit castling rights; no rights hashes to 0
+CASTLING_KEYS = [0] + [_generator.getrandbits(64) for _ in range(15)]
+
+EN_PASSANT_KEYS = [_generator.getrandbits(64) for _ in range(8)]
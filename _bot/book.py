@@ -0,0 +1,285 @@
+"""
+Polyglot-format opening book, read through mmap.
+
+A book is a file of 16-byte big-endian entries (key, move, weight, learn)
+sorted by key. The file is mapped rather than read, and a position's
+entries are found by binary search, so opening a book costs nothing and
+a probe touches a handful of pages.
+
+The key of a position depends on the 781 random numbers the book was
+written with. Books made by write_book use the board's own Zobrist key.
+Standard Polyglot books need Polyglot's Random64 table, loaded with
+load_polyglot_randoms and passed to OpeningBook.
+"""
+import mmap
+import random
+import struct
+from typing import Optional
+from _board.attacks import PAWN_ATTACKS
+from _board.board import Board
+from _board.move import KING_CASTLE, QUEEN_CASTLE, find_uci_move, move_to_uci
+from _board.castling import BLACK_KINGSIDE, BLACK_QUEENSIDE, WHITE_KINGSIDE, WHITE_QUEENSIDE
+from _enums.color import Color
+from _enums.piece_type import PieceType
+
+ENTRY = struct.Struct(">QHHI")
+KEY = struct.Struct(">Q")
+
+PROMOTION_LETTERS = ["", "n", "b", "r", "q"]
+
+# Polyglot writes castling as the king taking its own rook
+CASTLING_MOVES = {"e1h1": "e1g1", "e1a1": "e1c1", "e8h8": "e8g8", "e8a8": "e8c8"}
+CASTLING_ENCODINGS = {castle: rook for rook, castle in CASTLING_MOVES.items()}
+
+# Piece kind order of the Polyglot random table (black before white)
+POLYGLOT_KINDS = [PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP,
+                  PieceType.ROOK, PieceType.QUEEN, PieceType.KING]
+POLYGLOT_RANDOM_COUNT = 781
+
+# Elo at which book weights are used as they are; weaker bots flatten them
+REFERENCE_ELO = 800
+
+
+def load_polyglot_randoms(path: str) -> list[int]:
+    """
+    Read Polyglot's Random64 table
+
+    Args:
+        path: File of 781 big-endian unsigned 64-bit numbers
+    Returns:
+        List of the 781 random numbers
+    """
+    with open(path, "rb") as table_file:
+        data = table_file.read()
+    if len(data) != POLYGLOT_RANDOM_COUNT * 8:
+        raise ValueError(f"{path} does not hold {POLYGLOT_RANDOM_COUNT} 64-bit numbers")
+    return list(struct.unpack(f">{POLYGLOT_RANDOM_COUNT}Q", data))
+
+
+def polyglot_key(board: Board, randoms: list[int]) -> int:
+    """
+    Hash a position the way Polyglot books do
+
+    Args:
+        board: The position
+        randoms: Polyglot's Random64 table
+    Returns:
+        64-bit Polyglot key
+    """
+    key = 0
+    for color in Color:
+        for piece_type, squares in board.bitboards[color].items():
+            kind = POLYGLOT_KINDS.index(piece_type) * 2 + (color == Color.WHITE)
+            while squares:
+                low_bit = squares & -squares
+                key ^= randoms[64 * kind + low_bit.bit_length() - 1]
+                squares ^= low_bit
+
+    for offset, right in enumerate((WHITE_KINGSIDE, WHITE_QUEENSIDE,
+                                    BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+        if board.castling_rights & right:
+            key ^= randoms[768 + offset]
+
+    # Like the board's own key, en passant only counts when it can be taken
+    if board.en_passant_target:
+        file, rank = board.en_passant_target
+        capturers = PAWN_ATTACKS[board.active_color.opposite()][rank * 8 + file]
+        if capturers & board.bitboards[board.active_color][PieceType.PAWN]:
+            key ^= randoms[772 + file]
+
+    if board.active_color == Color.WHITE:
+        key ^= randoms[780]
+    return key
+
+
+def decode_book_move(raw: int, board: Optional[Board] = None) -> str:
+    """
+    Convert a Polyglot move field to UCI notation
+
+    Args:
+        raw: 16-bit move from a book entry
+        board: Position the entry belongs to; castling is only recognised
+               when a king stands on the from square, since e1h1 can also
+               be an ordinary rook move. Without a board the move is
+               returned as stored.
+    Returns:
+        Move string such as "e2e4", with castling as the king's two-step
+    """
+    to_file, to_rank = raw & 7, (raw >> 3) & 7
+    from_file, from_rank = (raw >> 6) & 7, (raw >> 9) & 7
+    text = (f"{chr(ord('a') + from_file)}{from_rank + 1}"
+            f"{chr(ord('a') + to_file)}{to_rank + 1}{PROMOTION_LETTERS[(raw >> 12) & 7]}")
+    if text in CASTLING_MOVES and board is not None:
+        piece = board.piece_at(from_rank * 8 + from_file)
+        if piece is not None and piece.piece_type == PieceType.KING:
+            return CASTLING_MOVES[text]
+    return text
+
+
+def encode_book_move(move: int) -> int:
+    """
+    Convert a board move to a Polyglot move field
+
+    Args:
+        move: Encoded move; its flags, not its squares, mark castling, so
+              a rook going e1-g1 is not mistaken for O-O
+    Returns:
+        16-bit Polyglot move
+    """
+    text = move_to_uci(move)
+    if move >> 12 in (KING_CASTLE, QUEEN_CASTLE):
+        text = CASTLING_ENCODINGS[text]
+    raw = ((ord(text[2]) - ord('a')) | (int(text[3]) - 1) << 3 |
+           (ord(text[0]) - ord('a')) << 6 | (int(text[1]) - 1) << 9)
+    if len(text) > 4:
+        raw |= PROMOTION_LETTERS.index(text[4]) << 12
+    return raw
+
+
+class OpeningBook:
+    """
+    Memory-mapped Polyglot book
+
+    Attributes:
+        path: Book file path
+        randoms: Polyglot random table, or None to key by Board.zobrist_key
+        size: Number of entries in the book
+    """
+
+    def __init__(self, path: str, randoms: Optional[list[int]] = None) -> None:
+        """
+        Map a book file
+
+        Args:
+            path: Book file path
+            randoms: Polyglot's Random64 table for standard books, None for
+                     books written by write_book
+        """
+        self.path = path
+        self.randoms = randoms
+        with open(path, "rb") as book_file:
+            self.data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self.data) // ENTRY.size
+
+    def close(self):
+        """ Unmap the book file """
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def key(self, board: Board) -> int:
+        """
+        Hash a position with the book's key scheme
+
+        Args:
+            board: The position
+        Returns:
+            64-bit key
+        """
+        if self.randoms is None:
+            return board.zobrist_key
+        return polyglot_key(board, self.randoms)
+
+    def _lower_bound(self, key: int) -> int:
+        """ Index of the first entry whose key is not below key """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(self.data, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entries(self, key: int) -> list[tuple[int, int]]:
+        """
+        Get the raw book entries for a key
+
+        Args:
+            key: Position key
+        Returns:
+            List of (Polyglot move, weight)
+        """
+        found = []
+        index = self._lower_bound(key)
+        while index < self.size:
+            entry_key, raw, weight, _ = ENTRY.unpack_from(self.data, index * ENTRY.size)
+            if entry_key != key:
+                break
+            found.append((raw, weight))
+            index += 1
+        return found
+
+    def find_moves(self, board: Board) -> list[tuple[int, int]]:
+        """
+        Get the book moves for the side to move that are legal here
+
+        Args:
+            board: The position
+        Returns:
+            List of (encoded move, weight), empty when out of book
+        """
+        book_moves = self.entries(self.key(board))
+        if not book_moves:
+            return []
+
+        legal = board.get_all_moves(board.active_color)
+        moves = []
+        for raw, weight in book_moves:
+            move = find_uci_move(legal, decode_book_move(raw, board))
+            if move is not None:
+                moves.append((move, weight))
+        return moves
+
+    def choose_move(self, board: Board, elo: int = REFERENCE_ELO,
+                    rng: Optional[random.Random] = None) -> Optional[int]:
+        """
+        Pick a book move at random in proportion to its weight
+
+        Args:
+            board: The position
+            elo: Playing strength; lower values flatten the weights so weak
+                 bots stray from the main lines, higher values sharpen them
+            rng: Random generator to draw from
+        Returns:
+            Encoded move, or None when out of book
+        """
+        moves = self.find_moves(board)
+        if not moves:
+            return None
+
+        exponent = max(elo, 1) / REFERENCE_ELO
+        weights = [(weight or 1) ** exponent for _, weight in moves]
+        return (rng or random).choices([move for move, _ in moves], weights)[0]
+
+
+def write_book(path: str, lines: list[list[str]], start_fen: Optional[str] = None):
+    """
+    Build a book from opening lines, keyed by Board.zobrist_key
+
+    Args:
+        path: Output file path
+        lines: Opening lines as lists of UCI moves; a move's weight is the
+               number of lines that play it
+        start_fen: Position the lines start from, the initial position by default
+    """
+    weights = {}
+    for line in lines:
+        board = Board()
+        if start_fen:
+            board.load_fen(start_fen)
+        for text in line:
+            move = find_uci_move(board.generate_moves(), text)
+            if move is None:
+                raise ValueError(f"Illegal book move {text} in line {' '.join(line)}")
+            entry = (board.zobrist_key, encode_book_move(move))
+            weights[entry] = weights.get(entry, 0) + 1
+            board.push(move)
+
+    with open(path, "wb") as book_file:
+        for (key, raw), weight in sorted(weights.items()):
+            book_file.write(ENTRY.pack(key, raw, min(weight, 0xFFFF), 0))
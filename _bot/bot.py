@@ -1,43 +1,382 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from _enums.color import Color
-from _enums.piece_type import PieceType
-from stockfish import Stockfish
+from _board.move import find_uci_move, move_to_tuple
+from _board.tablebase import DEFAULT_DIRECTORY as DEFAULT_TABLEBASES, Tablebase
+from _bot.book import OpeningBook
+from _bot.engine import Engine
+from _bot.uci import BlockingUCIEngine, SearchControl
 from _game.import_stockfish import import_stockfish
 
+# Elo points per ply of built-in engine search depth
+ELO_PER_PLY = 400
+
+# Opening book probed before asking either backend, if present
+DEFAULT_BOOK = "_assets/book.bin"
+
+# Stockfish search depth when there is no time limit
+STOCKFISH_DEPTH = 15
+
+# UCI_Elo range Stockfish accepts; weaker settings use Skill Level instead
+STOCKFISH_MIN_ELO = 1320
+STOCKFISH_MAX_ELO = 3190
+MAX_SKILL_LEVEL = 20
+
+
+def stockfish_strength(elo: int) -> dict:
+    """
+    Translate an Elo setting into Stockfish UCI options
+
+    Args:
+        elo: Requested playing strength
+    Returns:
+        Dict of option name to value for UCIEngine.set_options
+    """
+    if elo >= STOCKFISH_MIN_ELO:
+        return {"UCI_LimitStrength": True, "UCI_Elo": min(elo, STOCKFISH_MAX_ELO)}
+    # Below Stockfish's Elo floor: one skill level per 100 points above 400
+    skill = max(0, min(MAX_SKILL_LEVEL, (elo - 400) // 100))
+    return {"UCI_LimitStrength": False, "Skill Level": skill}
+
+
 class Bot:
-    def __init__(self) -> None:
-        stockfish_path = import_stockfish()
-        if stockfish_path is None:
-            raise FileNotFoundError("Could not find or download Stockfish executable")
+    def __init__(self, backend: str = None, time_limit: float = 1.0,
+                 book_path: str = DEFAULT_BOOK,
+                 tablebase_path: str = DEFAULT_TABLEBASES, ponder: bool = True) -> None:
+        """
+        Set up the bot's move source
 
-        print(f"Using Stockfish at: {stockfish_path}")
-        self.stockfish = Stockfish(path=stockfish_path, parameters={"UCI_Elo": 100})
+        Args:
+            backend: "stockfish", "engine" for the built-in search, or None
+                     to use Stockfish when it can be found and the built-in
+                     engine otherwise
+            time_limit: Seconds the bot may think per move
+            book_path: Opening book to play from while in book; ignored if
+                       the file does not exist
+            tablebase_path: Folder of endgame tables (see _board.tablebase)
+                            to play perfectly from; ignored if missing
+            ponder: Search the expected reply while the user thinks
+        """
         self.color = Color.BLACK
+        self.stockfish = None
+        self.engine = Engine(max_depth=1)
+        self.time_limit = time_limit
+        self.elo = 100
+        self.book = OpeningBook(book_path) if book_path and os.path.exists(book_path) else None
+        self.tablebase = (Tablebase(tablebase_path)
+                          if tablebase_path and os.path.isdir(tablebase_path) else None)
+
+        # One thread runs every search and Stockfish call in order, so the
+        # GUI never waits on the engine and engine calls never interleave
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot")
+        # (position key, stop event, Stockfish search control, future) of the
+        # move being chosen
+        self.pending = None
+
+        # While pondering, pending holds a search of the position after the
+        # user's expected reply; it only becomes the real search on a hit
+        self.ponder = ponder
+        self.pondering = False
+        self.ponder_timer = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        # Reply Stockfish expects to the move it just chose
+        self.ponder_move = None
+
+        if backend != "engine":
+            stockfish_path = import_stockfish()
+            if stockfish_path is not None:
+                print(f"Using Stockfish at: {stockfish_path}")
+                self.stockfish = BlockingUCIEngine(stockfish_path)
+                self.stockfish.set_options(stockfish_strength(self.elo))
+            elif backend == "stockfish":
+                raise FileNotFoundError("Could not find or download Stockfish executable")
+            else:
+                print("Stockfish unavailable, using the built-in engine")
+
+        self.backend = "stockfish" if self.stockfish is not None else "engine"
 
     def set_elo(self, elo: int):
-        stockfish_path = import_stockfish()
-        self.stockfish = Stockfish(path=stockfish_path, parameters={"UCI_Elo": elo})
+        """
+        Change the playing strength of the running backend in place
+
+        Args:
+            elo: Requested playing strength
+        """
+        self.elo = elo
+        if self.backend == "engine":
+            self.engine.max_depth = max(1, elo // ELO_PER_PLY)
+            return
+        # A ponder search only ends on ponderhit or stop, so drop it rather
+        # than queue the change behind it; a real search finishes first
+        if self.pondering:
+            self.cancel_move()
+        self.worker.submit(self.stockfish.set_options, stockfish_strength(elo))
+
+    def close(self):
+        """ Stop the Stockfish process and worker pool and unmap data files """
+        self.cancel_move()
+        self.worker.shutdown(wait=True, cancel_futures=True)
+        if self.stockfish is not None:
+            self.stockfish.close()
+            self.stockfish = None
+        self.engine.close()
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+        if self.tablebase is not None:
+            self.tablebase.close()
+            self.tablebase = None
+
+    def best_move_uci(self, fen: str, ponder: bool = False,
+                      control: SearchControl = None) -> str | None:
+        """
+        Get Stockfish's best move as a UCI string such as "e7e8q"
+
+        Args:
+            fen: Position to search
+            ponder: Search in ponder mode until ponderhit or stop
+            control: Control of the search, for stop and ponderhit
+
+        Returns:
+            The move, or None if Stockfish found none
+        """
+        if self.time_limit is None:
+            limits = {"depth": STOCKFISH_DEPTH}
+        else:
+            limits = {"movetime": max(1, int(self.time_limit * 1000))}
+        result = self.stockfish.go(fen, ponder=ponder, control=control, **limits)
+        self.ponder_move = result.ponder_move
+        print(result.best_move)
+        return result.best_move
 
     def next_move(self, fen: str) -> list[tuple[int, int]]:
         """Get the next move coordinates from Stockfish"""
         files = {"a": 0, "b": 1, "c": 2,
                  "d": 3, "e": 4, "f": 5,
                  "g": 6, "h": 7}
-        position = self.stockfish.set_fen_position(fen)
-        best_move = self.stockfish.get_best_move(position)
-        print(self.stockfish.is_fen_valid(fen=fen))
-        print(best_move)
+        best_move = self.best_move_uci(fen)
         start_file = files[best_move[0]]
         start_rank = best_move[1]
         move_to_file = files[best_move[2]]
         move_to_rank = best_move[3]
-        print(self.stockfish.get_parameters())
         return [(int(start_rank) - 1, start_file), (int(move_to_rank) - 1, move_to_file)]
 
 
+    @property
+    def is_thinking(self) -> bool:
+        """ True while a move started with start_move has not been collected """
+        return self.pending is not None and not self.pondering
+
+    @property
+    def ponder_hit_rate(self) -> float:
+        """ Share of this game's ponder searches whose predicted reply was played """
+        total = self.ponder_hits + self.ponder_misses
+        return self.ponder_hits / total if total else 0.0
+
+    def new_game(self):
+        """ Drop any search, start a new Stockfish game and reset the ponder statistics """
+        self.cancel_move()
+        if self.stockfish is not None:
+            self.worker.submit(self.stockfish.new_game)
+        if self.ponder_hits or self.ponder_misses:
+            print(f"Ponder hit rate: {self.ponder_hit_rate:.0%} "
+                  f"({self.ponder_hits}/{self.ponder_hits + self.ponder_misses})")
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+
+    def start_move(self, board, bot_color: Color):
+        """
+        Start choosing a move on the worker thread; collect it with
+        move_ready and finish_move. A ponder search of this exact position
+        is kept and given the normal time limit; anything else still
+        running is cancelled.
+
+        Args:
+            board: The Board to move on; the search works on a clone
+            bot_color: The color the bot is playing
+        """
+        if self.pondering:
+            self.pondering = False
+            if self.pending[0] == _position_key(board):
+                # Ponder hit: the search already under way is the one we need
+                self.ponder_hits += 1
+                if self.stockfish is not None:
+                    self.stockfish.ponderhit(self.pending[2])
+                elif self.time_limit is not None:
+                    self.ponder_timer = threading.Timer(self.time_limit, self.pending[1].set)
+                    self.ponder_timer.daemon = True
+                    self.ponder_timer.start()
+                return
+            self.ponder_misses += 1
+
+        self.cancel_move()
+        stop = threading.Event()
+        control = SearchControl()
+        future = self.worker.submit(self.choose_move, board.clone(), bot_color, stop, False, control)
+        self.pending = (_position_key(board), stop, control, future)
+
+    def move_ready(self) -> bool:
+        """ True once the move started with start_move has been chosen """
+        return self.pending is not None and not self.pondering and self.pending[3].done()
+
+    def finish_move(self, board) -> tuple[tuple[int, int], tuple[int, int]] | None:
+        """
+        Play the move chosen on the worker thread
+
+        Args:
+            board: The Board passed to start_move
+
+        Returns:
+            Tuple of (from_pos, to_pos) if move was made, None if there was
+            no move, the search failed or the board has changed since
+            start_move. After a failed Stockfish search the built-in engine
+            starts over and is_thinking stays True.
+        """
+        key, _, _, future = self.pending
+        self.pending = None
+        self._stop_ponder_timer()
+        if key != _position_key(board):
+            return None
+        try:
+            move = future.result()
+        except Exception as error:
+            # A crashed engine must not take the GUI down: report it, and if
+            # it was Stockfish search again on the worker with the built-in
+            # engine, leaving is_thinking set until that move is ready
+            print(f"Bot search failed: {error!r}")
+            if self.stockfish is not None:
+                self._drop_stockfish()
+                self.start_move(board, board.active_color)
+            return None
+        if move is None:
+            return None
+        played = self.apply_move(board, move)
+        if self.ponder:
+            self.start_ponder(board, board.active_color.opposite())
+        return played
+
+    def start_ponder(self, board, bot_color: Color):
+        """
+        Search the position after the user's expected reply while the user
+        thinks. Stockfish names the reply with its best move; the built-in
+        engine finds it in its table.
+
+        Args:
+            board: The Board, with the bot's move just played
+            bot_color: The color the bot is playing
+        """
+        if board.active_color == bot_color:
+            return
+        if self.stockfish is not None:
+            reply = (find_uci_move(board.generate_moves(), self.ponder_move)
+                     if self.ponder_move else None)
+        else:
+            reply = self.engine.expected_move(board)
+        if reply is None:
+            return
+
+        position = board.clone()
+        position.push(reply)
+        key = (position.zobrist_key, len(board.undo_stack) + 1)
+        stop = threading.Event()
+        control = SearchControl()
+        future = self.worker.submit(self.choose_move, position, bot_color, stop, True, control)
+        self.pending = (key, stop, control, future)
+        self.pondering = True
+
+    def cancel_move(self):
+        """ Abandon the move being chosen, stopping the search early """
+        self._stop_ponder_timer()
+        self.pondering = False
+        if self.pending is not None:
+            _, stop, control, future = self.pending
+            stop.set()
+            future.cancel()
+            if self.stockfish is not None:
+                self.stockfish.stop(control)
+            self.pending = None
+
+    def _drop_stockfish(self):
+        """ Close Stockfish and switch to the built-in engine at the current Elo """
+        print("Falling back to the built-in engine")
+        self.stockfish.close()
+        self.stockfish = None
+        self.backend = "engine"
+        self.engine.max_depth = max(1, self.elo // ELO_PER_PLY)
+
+    def _stop_ponder_timer(self):
+        """ Cancel the clock started by a ponder hit """
+        if self.ponder_timer is not None:
+            self.ponder_timer.cancel()
+            self.ponder_timer = None
+
+    def choose_move(self, board, bot_color: Color, stop: threading.Event = None,
+                    ponder: bool = False, control: SearchControl = None) -> int | None:
+        """
+        Pick the bot's move without playing it
+
+        Args:
+            board: The position; only restored, never changed
+            bot_color: The color the bot is playing
+            stop: Event that ends the built-in engine's search early
+            ponder: Search in ponder mode: no time limit for the built-in
+                    engine, "go ponder" for Stockfish
+            control: Control of the Stockfish search
+
+        Returns:
+            Encoded move, or None if there is none
+        """
+        # Only a Stockfish search names the reply to ponder on; forget the
+        # last one so a book or tablebase move does not reuse it
+        self.ponder_move = None
+
+        # Tablebase and book moves need no engine call at all
+        move = None
+        if self.tablebase is not None and board.active_color == bot_color:
+            move = self.tablebase.best_move(board)
+        if move is None and self.book is not None and board.active_color == bot_color:
+            move = self.book.choose_move(board, self.elo)
+
+        if move is None and self.backend == "engine":
+            time_limit = None if ponder else self.time_limit
+            move = self.engine.best_move(board, bot_color, time_limit=time_limit, stop=stop)
+        elif move is None:
+            # Get best move from Stockfish and match it against our legal moves
+            best_move = self.best_move_uci(board.board_state(active_color=bot_color),
+                                           ponder, control)
+            if best_move is None:
+                return None
+            move = find_uci_move(board.get_all_moves(bot_color), best_move)
+            if move is None:
+                print(f"Ignoring illegal bot move {best_move}")
+                move = self.engine.best_move(board, bot_color, time_limit=self.time_limit,
+                                             stop=stop)
+        return move
+
+    def apply_move(self, board, move: int) -> tuple[tuple[int, int], tuple[int, int]]:
+        """
+        Play an encoded move through the board's GUI move path
+
+        Args:
+            board: The Board object to make the move on
+            move: Encoded move
+
+        Returns:
+            Tuple of (from_pos, to_pos) as (rank, file) pairs
+        """
+        (from_file, from_rank), (to_file, to_rank), promotion = move_to_tuple(move)
+
+        # Select and move the piece, promoting to whatever the backend chose
+        board.selected_piece = board.grid[from_rank][from_file].piece_here
+        board.move_piece(to_file, to_rank, promotion)
+
+        return ((from_rank, from_file), (to_rank, to_file))
+
     def make_move(self, board, bot_color: Color) -> tuple[tuple[int, int], tuple[int, int]] | None:
         """
-        Execute the bot's move on the board.
+        Execute the bot's move on the board, waiting for the search.
 
         Args:
             board: The Board object to make the move on
@@ -50,25 +389,12 @@ class Bot:
         if not board.is_curr_pos() or board.checkmate or board.stalemate:
             return None
 
-        # Get best move from Stockfish
-        bot_moves = self.next_move(fen=board.board_state(active_color=bot_color))
-        from_pos = bot_moves[0]
-        to_pos = bot_moves[1]
-
-        # Select and move the piece
-        board.selected_piece = board.grid[from_pos[0]][from_pos[1]].piece_here
-        board.move_piece(to_pos[1], to_pos[0])
-
-        # Check for pawn promotion
-        final_rank = to_pos[0]
-        final_file = to_pos[1]
-        piece = board.grid[final_rank][final_file].piece_here
+        move = self.choose_move(board, bot_color)
+        if move is None:
+            return None
+        return self.apply_move(board, move)
 
-        if (piece and piece.piece_type == PieceType.PAWN and
-                final_rank == (0 if bot_color == Color.BLACK else 7) and
-                piece.color == bot_color):
-            print(f"{bot_color.name} PAWN PROMOTED")
-            piece.promote()
-            board.promote(bot_color, final_file, final_rank)
 
-        return (from_pos, to_pos)
\ No newline at end of file
+def _position_key(board) -> tuple[int, int]:
+    """ Identify a board position together with how it was reached """
+    return (board.zobrist_key, len(board.undo_stack))
@@ -0,0 +1,525 @@
+"""
+In-process chess engine: iterative deepening alpha-beta search on Board.
+
+Runs without Stockfish, so it doubles as the offline Bot backend and as a
+zero-IPC opponent for headless play. The search works on a clone of the
+board it is given, so the caller's board is never touched. With jobs > 1
+the root moves are split over worker processes instead.
+"""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Optional
+from _board.board import Board, MATERIAL_VALUES
+from _board.move import CAPTURE, PROMOTION, NULL_MOVE
+from _enums.color import Color
+
+MATE_SCORE = 100000
+# Scores beyond this are mates; the distance to mate is stored in the rest
+MATE_THRESHOLD = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+
+# Transposition table bound types
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Move ordering tiers
+TT_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 20
+KILLER_SCORE = 1 << 19
+
+MAX_PLY = 64
+
+# How often (in nodes) the clock is checked
+CHECK_INTERVAL = 1024
+
+# Seconds between deadline and stop checks while waiting on worker processes
+POLL_INTERVAL = 0.01
+
+
+class SearchTimeout(Exception):
+    """ Raised inside the search when the budget runs out or it is stopped """
+
+
+class Engine:
+    """
+    Alpha-beta searcher with iterative deepening, quiescence search,
+    a transposition table and MVV-LVA / killer / history move ordering
+
+    Attributes:
+        max_depth: Deepest iteration to run
+        table_size: Maximum transposition table entries before it is cleared
+        nodes: Nodes visited by the last search
+        depth: Deepest completed iteration of the last search
+        score: Score of the last search in centipawns, side to move's view
+    """
+
+    def __init__(self, max_depth: int = MAX_PLY, table_size: int = 1 << 18) -> None:
+        """
+        Initialize the engine
+
+        Args:
+            max_depth: Deepest iteration to run
+            table_size: Maximum transposition table entries
+        """
+        self.max_depth = max_depth
+        self.table_size = table_size
+        self.table = {}
+        self.killers = [[NULL_MOVE, NULL_MOVE] for _ in range(MAX_PLY)]
+        self.history = [0] * 4096
+        self.nodes = 0
+        self.depth = 0
+        self.score = 0
+        self.node_limit = None
+        self.deadline = None
+        self.stop = None
+        self.pool = None
+        self.jobs = 0
+        # Shared with the worker processes, which stop searching once it is set
+        self.worker_stop = None
+
+    def close(self):
+        """ Shut down the worker processes, if any were started """
+        if self.pool is not None:
+            self.worker_stop.set()
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def clear(self):
+        """ Forget everything learned from earlier searches """
+        self.table.clear()
+        self.killers = [[NULL_MOVE, NULL_MOVE] for _ in range(MAX_PLY)]
+        self.history = [0] * 4096
+
+    def best_move(self, board: Board, color: Color = None,
+                  time_limit: Optional[float] = 1.0,
+                  node_limit: Optional[int] = None, jobs: int = 1,
+                  stop: Optional[threading.Event] = None) -> Optional[int]:
+        """
+        Search a position and return the best move found
+
+        Args:
+            board: Position to search; it is cloned, never modified
+            color: Side to find a move for, the board's side to move by default
+            time_limit: Wall-clock budget in seconds, None for no limit
+            node_limit: Node budget, None for no limit; ignored when jobs > 1
+            jobs: Worker processes to split the root moves over
+            stop: Event another thread sets to end the search early; the
+                  best move of the last finished iteration is returned
+        Returns:
+            Encoded move, or None if the side has no legal move
+        """
+        board = board.clone()
+        if color is not None and color != board.active_color:
+            board.active_color = color
+            board.en_passant_target = None
+            board.zobrist_key = board.compute_zobrist()
+
+        moves = board.generate_moves()
+        if not moves:
+            return None
+
+        self.nodes = 0
+        self.depth = 0
+        self.node_limit = node_limit
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self.stop = stop
+        self.killers = [[NULL_MOVE, NULL_MOVE] for _ in range(MAX_PLY)]
+
+        if jobs > 1 and len(moves) > 1:
+            return self._parallel_root(board, list(moves), jobs)
+
+        best = moves[0]
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._root(board, depth)
+            except SearchTimeout:
+                break
+            if move is not None:
+                best = move
+            self.depth = depth
+            self.score = score
+            # A forced mate will not improve with more depth
+            if abs(score) >= MATE_THRESHOLD:
+                break
+        return best
+
+    def _root(self, board: Board, depth: int):
+        """
+        Search every root move to a fixed depth
+
+        Args:
+            board: Position to search
+            depth: Plies to search
+        Returns:
+            Tuple of (score, best move)
+        """
+        alpha, beta = -INFINITY, INFINITY
+        best_move = None
+        for move in self._ordered_moves(board, board.generate_moves(), 0):
+            board.push(move)
+            try:
+                score = -self._search(board, depth - 1, -beta, -alpha, 1)
+            finally:
+                board.pop()
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self._store(board.zobrist_key, depth, alpha, EXACT, best_move, 0)
+        return alpha, best_move
+
+    def expected_move(self, board: Board) -> Optional[int]:
+        """
+        Look up the move the last search expects in a position, e.g. the
+        opponent's reply to the move it just chose
+
+        Args:
+            board: The position
+        Returns:
+            Encoded legal move, or None if the table has no move for it
+        """
+        entry = self.table.get(board.zobrist_key)
+        if entry is None or entry[3] == NULL_MOVE or entry[3] not in board.generate_moves():
+            return None
+        return entry[3]
+
+    def _parallel_root(self, board: Board, moves: list, jobs: int) -> int:
+        """
+        Iterative deepening with the root moves spread over worker processes.
+        Each iteration searches the previous best move first, then hands the
+        other moves to the workers with its score as the bound to beat, so
+        they only need a null-window search unless they turn out better.
+        Every worker keeps its own engine and table across iterations and
+        searches. The snapshot carries no move history, so workers cannot
+        see repetitions of positions played before the root.
+
+        Args:
+            board: Position to search
+            moves: Legal root moves
+            jobs: Number of worker processes
+        Returns:
+            Encoded move
+        """
+        if self.pool is None or self.jobs != jobs:
+            self.close()
+            self.worker_stop = multiprocessing.Event()
+            self.pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                            initargs=(self.worker_stop,))
+            self.jobs = jobs
+        self.worker_stop.clear()
+
+        position = board.snapshot()
+        best = moves[0]
+        for depth in range(1, self.max_depth + 1):
+            first = self._search_root_moves(position, moves[:1], depth, -INFINITY)
+            if first is None:
+                break
+            others = self._search_root_moves(position, moves[1:], depth, first[0])
+            if others is None:
+                break
+
+            scores = first + others
+            # Stable sort: equal scores keep their order, so ties go to the
+            # earlier move and the best move is searched first next time
+            order = sorted(range(len(moves)), key=lambda index: -scores[index])
+            moves = [moves[index] for index in order]
+            best = moves[0]
+            self.depth = depth
+            self.score = scores[order[0]]
+            if abs(self.score) >= MATE_THRESHOLD:
+                break
+        return best
+
+    def _search_root_moves(self, position, moves: list, depth: int,
+                           alpha: int) -> Optional[list[int]]:
+        """
+        Score root moves in the worker processes
+
+        Args:
+            position: Snapshot of the root position
+            moves: Root moves to search
+            depth: Plies to search, root move included
+            alpha: Score already reached; moves that cannot beat it only
+                   get an upper bound
+        Returns:
+            Scores in the order of moves, or None if the deadline passed or
+            the search was stopped first
+        """
+        # Only this process reads the clock: perf_counter values mean nothing
+        # in another process, so workers stop on worker_stop alone
+        futures = [self.pool.submit(_search_root_move, position, move, depth, alpha)
+                   for move in moves]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            if ((self.deadline is not None and time.perf_counter() >= self.deadline) or
+                    (self.stop is not None and self.stop.is_set())):
+                # Drop the queued moves and wait for the running ones, which
+                # return as soon as they see the shared stop flag
+                self.worker_stop.set()
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+                self.worker_stop.clear()
+                return None
+
+        results = [future.result() for future in futures]
+        if None in results:
+            return None
+        self.nodes += sum(nodes for _, nodes in results)
+        return [score for score, _ in results]
+
+    def _search(self, board: Board, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Negamax alpha-beta search
+
+        Args:
+            board: Position to search
+            depth: Remaining plies
+            alpha: Lower bound of the window
+            beta: Upper bound of the window
+            ply: Distance from the root
+        Returns:
+            Score from the side to move's point of view
+        """
+        self._count_node()
+
+        if board.halfmove_clock >= 100 or board.is_repetition(2):
+            return 0
+
+        key = board.zobrist_key
+        entry = self.table.get(key)
+        tt_move = NULL_MOVE
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, tt_move = entry
+            # Mate scores are stored relative to the node, not the root
+            if entry_score > MATE_THRESHOLD:
+                entry_score -= ply
+            elif entry_score < -MATE_THRESHOLD:
+                entry_score += ply
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    return entry_score
+                if entry_flag == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if entry_flag == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+
+        if depth <= 0:
+            return self._quiesce(board, alpha, beta, ply)
+
+        moves = board.generate_moves()
+        if not moves:
+            if board.check_for_checks(board.active_color):
+                return -MATE_SCORE + ply
+            return 0
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = NULL_MOVE
+        for move in self._ordered_moves(board, moves, ply, tt_move):
+            board.push(move)
+            try:
+                score = -self._search(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not move & ((CAPTURE | PROMOTION) << 12):
+                    self._remember_cutoff(move, depth, ply)
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._store(key, depth, best_score, flag, best_move, ply)
+        return best_score
+
+    def _quiesce(self, board: Board, alpha: int, beta: int, ply: int) -> int:
+        """
+        Search captures and promotions only, so the static evaluation is
+        never taken in the middle of an exchange
+
+        Args:
+            board: Position to search
+            alpha: Lower bound of the window
+            beta: Upper bound of the window
+            ply: Distance from the root
+        Returns:
+            Score from the side to move's point of view
+        """
+        stand_pat = evaluate(board)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+        if ply >= MAX_PLY - 1:
+            return stand_pat
+
+        noisy = [move for move in board.generate_moves()
+                 if move & ((CAPTURE | PROMOTION) << 12)]
+        for move in self._ordered_moves(board, noisy, ply):
+            self._count_node()
+            board.push(move)
+            try:
+                score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _ordered_moves(self, board: Board, moves, ply: int, tt_move: int = NULL_MOVE) -> list:
+        """
+        Sort moves best-first: table move, captures by MVV-LVA, killers,
+        then quiet moves by history score
+
+        Args:
+            board: Position the moves belong to
+            moves: Encoded moves
+            ply: Distance from the root, for the killer slots
+            tt_move: Best move remembered by the transposition table
+        Returns:
+            List of moves in search order
+        """
+        killers = self.killers[ply] if ply < MAX_PLY else ()
+        history = self.history
+
+        def order(move):
+            if move == tt_move:
+                return TT_MOVE_SCORE
+            if move & (CAPTURE << 12):
+                victim = board.piece_at((move >> 6) & 63)
+                attacker = board.piece_at(move & 63)
+                # En passant lands on an empty square but takes a pawn
+                victim_value = MATERIAL_VALUES[victim.piece_type] if victim else 1
+                return CAPTURE_SCORE + victim_value * 16 - MATERIAL_VALUES[attacker.piece_type]
+            if move & (PROMOTION << 12):
+                return CAPTURE_SCORE + (move >> 12 & 3)
+            if move in killers:
+                return KILLER_SCORE
+            return history[move & 4095]
+
+        return sorted(moves, key=order, reverse=True)
+
+    def _remember_cutoff(self, move: int, depth: int, ply: int):
+        """
+        Record a quiet move that caused a beta cutoff
+
+        Args:
+            move: The move
+            depth: Remaining depth at the cutoff
+            ply: Distance from the root
+        """
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self.history[move & 4095] += depth * depth
+
+    def _store(self, key: int, depth: int, score: int, flag: int, move: int, ply: int):
+        """
+        Save a search result in the transposition table
+
+        Args:
+            key: Zobrist key of the position
+            depth: Depth the score was searched to
+            score: Score found
+            flag: EXACT, LOWER_BOUND or UPPER_BOUND
+            move: Best move found, NULL_MOVE if none
+            ply: Distance from the root, to store mates relative to the node
+        """
+        if score > MATE_THRESHOLD:
+            score += ply
+        elif score < -MATE_THRESHOLD:
+            score -= ply
+        if len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[key] = (depth, score, flag, move or NULL_MOVE)
+
+    def _count_node(self):
+        """ Count a node and stop the search when the budget is spent """
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+        if not self.nodes % CHECK_INTERVAL:
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise SearchTimeout()
+            if self.stop is not None and self.stop.is_set():
+                raise SearchTimeout()
+
+
+# Engine reused by the searches of one worker process
+_worker_engine = None
+
+
+def _init_worker(stop):
+    """
+    Set up a worker process's engine
+
+    Args:
+        stop: Event shared with the parent that ends the worker's search
+    """
+    global _worker_engine
+    _worker_engine = Engine()
+    _worker_engine.stop = stop
+
+
+def _search_root_move(position, move: int, depth: int,
+                      alpha: int) -> Optional[tuple[int, int]]:
+    """
+    Score one root move to a fixed depth; runs in a worker process
+
+    Args:
+        position: Snapshot of the root position
+        move: Encoded root move
+        depth: Plies to search, root move included
+        alpha: Score the move has to beat; -INFINITY for a full window
+    Returns:
+        Tuple of (score from the root side's point of view, nodes searched),
+        or None if the parent stopped the search. A score at or
+        below alpha is only an upper bound.
+    """
+    engine = _worker_engine
+    engine.nodes = 0
+    engine.node_limit = None
+
+    board = Board.from_position(position)
+    board.push(move)
+    try:
+        if alpha <= -INFINITY:
+            score = -engine._search(board, depth - 1, -INFINITY, INFINITY, 1)
+        else:
+            # Null window first: enough to show the move is no better
+            score = -engine._search(board, depth - 1, -alpha - 1, -alpha, 1)
+            if score > alpha:
+                score = -engine._search(board, depth - 1, -INFINITY, -alpha, 1)
+    except SearchTimeout:
+        return None
+    return score, engine.nodes
+
+
+def evaluate(board: Board) -> int:
+    """
+    Static evaluation in centipawns from the side to move's point of view
+
+    Args:
+        board: Position to evaluate
+    Returns:
+        Board.evaluate() with the sign flipped for Black
+    """
+    score = board.evaluate()
+    return score if board.active_color == Color.WHITE else -score
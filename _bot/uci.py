@@ -0,0 +1,362 @@
+"""
+Minimal asyncio client for UCI chess engines such as Stockfish.
+
+UCIEngine talks to the engine process through asyncio.create_subprocess_exec.
+It writes "position" and "go" in one batch without waiting in between,
+collects the "info" lines of each search, and times every command from
+the write to the engine's reply. BlockingUCIEngine runs the same client
+on a private event loop thread, for callers that are not async
+themselves, like the bot's worker thread.
+"""
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+# info fields whose value is a single integer
+INFO_INTEGERS = {"depth", "seldepth", "multipv", "nodes", "nps", "time", "hashfull",
+                 "tbhits", "currmovenumber", "cpuload", "sbhits"}
+
+# Seconds to wait for the engine to exit after "quit" before killing it
+QUIT_TIMEOUT = 2.0
+
+
+@dataclass(slots=True)
+class SearchResult:
+    """
+    Outcome of one "go" command
+
+    Attributes:
+        best_move: Move in UCI notation, None if the engine had no move
+        ponder_move: Reply the engine expects, if it named one
+        info: Fields of the last info line that carried a score
+        latency: Seconds from sending "go" to receiving "bestmove"
+    """
+    best_move: Optional[str]
+    ponder_move: Optional[str] = None
+    info: dict = field(default_factory=dict)
+    latency: float = 0.0
+
+
+def parse_info(line: str) -> dict:
+    """
+    Split an engine "info" line into its fields
+
+    Args:
+        line: Line starting with "info"
+    Returns:
+        Dict of field name to value: ints for counters, ("cp" | "mate", int)
+        for "score", a list of moves for "pv" and the rest of the line for
+        "string"
+    """
+    tokens = line.split()[1:]
+    info = {}
+    index = 0
+    while index < len(tokens):
+        name = tokens[index]
+        index += 1
+        if name in INFO_INTEGERS and index < len(tokens):
+            info[name] = int(tokens[index])
+            index += 1
+        elif name == "score" and index + 1 < len(tokens):
+            info["score"] = (tokens[index], int(tokens[index + 1]))
+            index += 2
+            if index < len(tokens) and tokens[index] in ("lowerbound", "upperbound"):
+                info["bound"] = tokens[index]
+                index += 1
+        elif name in ("pv", "refutation"):
+            info[name] = tokens[index:]
+            break
+        elif name == "string":
+            info[name] = " ".join(tokens[index:])
+            break
+        elif name == "currmove" and index < len(tokens):
+            info[name] = tokens[index]
+            index += 1
+    return info
+
+
+class SearchControl:
+    """
+    Stop and ponderhit requests for one go() call. Requests may come before
+    the search starts: go() applies them as soon as it has written "go",
+    so none is lost or sent to a later search.
+
+    Attributes:
+        stopped: stop() was requested
+        hit: ponderhit() was requested
+        engine: The UCIEngine while the search runs, otherwise None
+    """
+
+    def __init__(self) -> None:
+        """ Create the control for a search that has not started yet """
+        self.stopped = False
+        self.hit = False
+        self.engine = None
+
+
+def format_go(movetime: Optional[int] = None, nodes: Optional[int] = None,
+              depth: Optional[int] = None, ponder: bool = False) -> str:
+    """
+    Build a "go" command
+
+    Args:
+        movetime: Milliseconds to search
+        nodes: Node budget
+        depth: Plies to search
+        ponder: Search in ponder mode until "ponderhit" or "stop"
+    Returns:
+        Command line without the newline; "go infinite" if no limit is set
+    """
+    parts = ["go"]
+    if ponder:
+        parts.append("ponder")
+    for name, value in (("movetime", movetime), ("nodes", nodes), ("depth", depth)):
+        if value is not None:
+            parts += [name, str(value)]
+    if len(parts) == 1:
+        parts.append("infinite")
+    return " ".join(parts)
+
+
+class UCIEngine:
+    """
+    Async UCI engine process
+
+    Attributes:
+        path: Engine executable
+        name: Name the engine reported, once started
+        options: Option names the engine reported
+        latency: Command name -> list of round-trip times in seconds
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Prepare a client; call start() to launch the engine
+
+        Args:
+            path: Engine executable
+        """
+        self.path = path
+        self.name = None
+        self.options = set()
+        self.latency = defaultdict(list)
+        self.process = None
+        # One command at a time reads the engine's output
+        self.reading = asyncio.Lock()
+
+    async def start(self):
+        """ Launch the engine and complete the "uci" handshake """
+        self.process = await asyncio.create_subprocess_exec(
+            self.path, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+        async with self.reading:
+            start = time.perf_counter()
+            self._send("uci")
+            async for line in self._lines("uciok"):
+                if line.startswith("id name "):
+                    self.name = line[len("id name "):]
+                elif line.startswith("option name "):
+                    self.options.add(line[len("option name "):].split(" type ")[0])
+            self.latency["uci"].append(time.perf_counter() - start)
+
+    def _send(self, *lines: str):
+        """ Queue lines for the engine; they go out with the next drain """
+        self.process.stdin.write("".join(line + "\n" for line in lines).encode())
+
+    async def _lines(self, last: str):
+        """ Yield output lines up to and including the one starting with last """
+        while True:
+            raw = await self.process.stdout.readline()
+            if not raw:
+                raise EOFError(f"{self.path} exited")
+            line = raw.decode().strip()
+            yield line
+            if line.startswith(last):
+                return
+
+    async def is_ready(self):
+        """ Wait until the engine has processed everything sent so far """
+        async with self.reading:
+            start = time.perf_counter()
+            self._send("isready")
+            await self.process.stdin.drain()
+            async for _ in self._lines("readyok"):
+                pass
+            self.latency["isready"].append(time.perf_counter() - start)
+
+    async def set_options(self, options: dict):
+        """
+        Set engine options, then wait for the engine to apply them
+
+        Args:
+            options: Option name -> value; bools are sent as true/false
+        """
+        lines = []
+        for name, value in options.items():
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            lines.append(f"setoption name {name} value {value}")
+        self._send(*lines)
+        await self.is_ready()
+
+    async def new_game(self):
+        """ Tell the engine the next search belongs to a new game """
+        self._send("ucinewgame")
+        await self.is_ready()
+
+    async def go(self, fen: Optional[str] = None, moves: tuple = (),
+                 movetime: Optional[int] = None, nodes: Optional[int] = None,
+                 depth: Optional[int] = None, ponder: bool = False,
+                 control: Optional[SearchControl] = None) -> SearchResult:
+        """
+        Set a position and search it; both commands are written together
+
+        Args:
+            fen: Position to search, the start position if None
+            moves: UCI moves to play from that position first
+            movetime: Milliseconds to search
+            nodes: Node budget
+            depth: Plies to search
+            ponder: Search in ponder mode until ponderhit() or stop()
+            control: Control passed to stop() and ponderhit() for this search
+        Returns:
+            SearchResult of the search
+        """
+        position = f"position fen {fen}" if fen else "position startpos"
+        if moves:
+            position += " moves " + " ".join(moves)
+
+        async with self.reading:
+            start = time.perf_counter()
+            self._send(position, format_go(movetime, nodes, depth, ponder))
+            if control is not None:
+                # Requests made before the search started apply to it now
+                control.engine = self
+                if control.hit and ponder:
+                    self._send("ponderhit")
+                if control.stopped:
+                    self._send("stop")
+            await self.process.stdin.drain()
+
+            info = {}
+            try:
+                async for line in self._lines("bestmove"):
+                    if line.startswith("info") and " score " in line:
+                        info = parse_info(line)
+            finally:
+                if control is not None:
+                    control.engine = None
+            latency = time.perf_counter() - start
+            self.latency["go"].append(latency)
+
+        tokens = line.split()
+        best_move = tokens[1] if len(tokens) > 1 and tokens[1] != "(none)" else None
+        ponder_move = tokens[3] if len(tokens) > 3 and tokens[2] == "ponder" else None
+        return SearchResult(best_move, ponder_move, info, latency)
+
+    def stop(self, control: SearchControl):
+        """
+        End a search; its go() returns the best move so far
+
+        Args:
+            control: Control of the search, which may not have started yet
+        """
+        control.stopped = True
+        if control.engine is self:
+            self._send("stop")
+
+    def ponderhit(self, control: SearchControl):
+        """
+        The expected reply was played: turn a ponder search into a normal one
+
+        Args:
+            control: Control of the ponder search, which may not have started yet
+        """
+        control.hit = True
+        if control.engine is self:
+            self._send("ponderhit")
+
+    async def quit(self):
+        """ Ask the engine to exit, killing it if it does not """
+        if self.process is None or self.process.returncode is not None:
+            return
+        try:
+            self._send("quit")
+            await self.process.stdin.drain()
+            await asyncio.wait_for(self.process.wait(), QUIT_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError):
+            self.process.kill()
+            await self.process.wait()
+
+
+class BlockingUCIEngine:
+    """
+    UCIEngine driven from ordinary threads. The client runs on its own
+    event loop thread; calls block the calling thread only, and stop()
+    and ponderhit() may be called from any thread, before or while the
+    search they control runs.
+
+    Attributes:
+        engine: The underlying UCIEngine
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Launch an engine
+
+        Args:
+            path: Engine executable
+        """
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="uci", daemon=True)
+        self.thread.start()
+        self.engine = UCIEngine(path)
+        try:
+            self._call(self.engine.start())
+        except BaseException:
+            self._stop_loop()
+            raise
+
+    def _call(self, coroutine):
+        """ Run a coroutine on the client's loop and wait for its result """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def set_options(self, options: dict):
+        """ See UCIEngine.set_options """
+        self._call(self.engine.set_options(options))
+
+    def new_game(self):
+        """ See UCIEngine.new_game """
+        self._call(self.engine.new_game())
+
+    def go(self, fen: Optional[str] = None, moves: tuple = (), **limits) -> SearchResult:
+        """ See UCIEngine.go """
+        return self._call(self.engine.go(fen, moves, **limits))
+
+    def stop(self, control: SearchControl):
+        """ See UCIEngine.stop """
+        self.loop.call_soon_threadsafe(self.engine.stop, control)
+
+    def ponderhit(self, control: SearchControl):
+        """ See UCIEngine.ponderhit """
+        self.loop.call_soon_threadsafe(self.engine.ponderhit, control)
+
+    @property
+    def latency(self) -> dict:
+        """ Command name -> list of round-trip times in seconds """
+        return self.engine.latency
+
+    def close(self):
+        """ Quit the engine and stop the loop thread """
+        if self.loop.is_closed():
+            return
+        self._call(self.engine.quit())
+        self._stop_loop()
+
+    def _stop_loop(self):
+        """ Stop and close the client's event loop """
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
@@ -6,6 +6,10 @@ class Color(Enum):
     WHITE = auto()
     BLACK = auto()
 
+    # Identity hash; Enum's default hashes the member name in Python code,
+    # which dominates the board's per-color bitboard lookups
+    __hash__ = object.__hash__
+
     def opposite(self):
         """ Determine color of player and opponent """
         return Color.BLACK if self == Color.WHITE else Color.WHITE
@@ -0,0 +1,15 @@
+""" Enum for the state of a game """
+from enum import Enum, auto
+
+class GameStatus(Enum):
+    """ Whether the game goes on, and if not, how it ended """
+    ONGOING = auto()
+    CHECKMATE = auto()
+    STALEMATE = auto()
+    INSUFFICIENT_MATERIAL = auto()
+    FIFTY_MOVE = auto()
+    REPETITION = auto()
+
+    def is_draw(self):
+        """ Determine if the game ended without a winner """
+        return self not in (GameStatus.ONGOING, GameStatus.CHECKMATE)
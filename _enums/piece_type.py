@@ -9,3 +9,7 @@ class PieceType(Enum):
     KNIGHT = "N"
     BISHOP = "B"
     PAWN = "P"
+
+    # Identity hash; Enum's default hashes the member name in Python code,
+    # which dominates the board's per-type bitboard lookups
+    __hash__ = object.__hash__
@@ -8,3 +8,4 @@ class PieceValue(Enum):
     BISHOP = 3
     ROOK = 5
     QUEEN = 9
+    KING = 1000
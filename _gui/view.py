@@ -7,7 +7,7 @@ import time
 from arcade import color as C
 from _board.board import Board
 from _enums.color import Color
-from _enums.piece_type import PieceType
+from _enums.game_status import GameStatus
 from _assets.spritesheet import Spritesheet, ChessSprites
 from _game.game import Game
 from _bot.bot import Bot
@@ -25,6 +25,7 @@ DARK_SQ = (200, 190, 170)
 HIGHLIGHT_SQ = (118, 150, 86)
 PREV_SQ = (125, 135, 150)
 SIDEPANEL_BG = (50, 50, 50)
+EVAL_BAR_HEIGHT = 14
 CLICK_SQ = (255, 165, 0)
 
 
@@ -92,7 +93,30 @@ def draw_board(board: Board, origin_x: int, origin_y: int, square: int, user_col
             
 
 
-def draw_sidepanel(x: int, y: int, width: int, height: int, game: Game, board: Board):
+def draw_eval_bar(x: int, y: int, width: int, score: int):
+    """
+    Draw a horizontal evaluation bar, white's share growing from the left
+
+    Args:
+        x: X coordinate of the bar's left edge
+        y: Y coordinate of the bar's bottom edge
+        width: Width of the bar
+        score: Evaluation in centipawns from White's point of view
+    """
+    # Logistic curve: +-400 centipawns fills about 90% of the bar
+    white_share = 1 / (1 + 10 ** (-score / 400))
+    white_width = int(width * white_share)
+
+    arcade.draw_lbwh_rectangle_filled(x, y, width, EVAL_BAR_HEIGHT, C.BLACK)
+    if white_width:
+        arcade.draw_lbwh_rectangle_filled(x, y, white_width, EVAL_BAR_HEIGHT, C.WHITE)
+    arcade.draw_lbwh_rectangle_outline(x, y, width, EVAL_BAR_HEIGHT, C.GRAY, 1)
+    arcade.draw_text(f"{score / 100:+.1f}", x + width // 2, y + EVAL_BAR_HEIGHT // 2,
+                     C.GRAY, 9, anchor_x="center", anchor_y="center")
+
+
+def draw_sidepanel(x: int, y: int, width: int, height: int, game: Game, board: Board,
+                   thinking: bool = False):
     """
     Draw the side panel with game information
 
@@ -103,6 +127,7 @@ def draw_sidepanel(x: int, y: int, width: int, height: int, game: Game, board: B
         height: Height of panel
         game: The Game object containing game state
         board: The Board object containing board state
+        thinking: Whether the bot is choosing a move
     """
     # Background
     arcade.draw_lbwh_rectangle_filled(x, y, width, height, SIDEPANEL_BG)
@@ -112,7 +137,9 @@ def draw_sidepanel(x: int, y: int, width: int, height: int, game: Game, board: B
                      C.WHITE, 20, anchor_x="center", bold=True)
 
     # Current turn
-    if board.stalemate == False and board.checkmate == False:
+    if thinking:
+        turn_text = "Bot is thinking..."
+    elif board.stalemate == False and board.checkmate == False:
         turn_text = "White's Turn" if game.turn == Color.WHITE else "Black's Turn"
     elif board.stalemate == True:
         turn_text = "Stalemate!"
@@ -142,6 +169,8 @@ def draw_sidepanel(x: int, y: int, width: int, height: int, game: Game, board: B
     arcade.draw_text(material_msg, x + width // 2, y + height - 120,
                      C.WHITE, 14, anchor_x="center")
 
+    draw_eval_bar(x + 20, y + height - 150, width - 40, board.evaluate())
+
     # Color selection label and button
     arcade.draw_text("User plays as:", x + width // 2, y + 80,
                      C.WHITE, 14, anchor_x="center")
@@ -396,7 +425,7 @@ class GameView(arcade.View):
                 draw_board(self.board, self.origin_x, self.origin_y, self.square, self.game.user_color)
                 self.sprites.draw()
                 draw_sidepanel(self.sidepanel_x, 0, self.sidepanel_width,
-                            self.window.height, self.game, self.board)
+                            self.window.height, self.game, self.board, self.bot.is_thinking)
                 self.manager.draw()
 
                 self.window.use()
@@ -410,7 +439,8 @@ class GameView(arcade.View):
             self.clear()
             draw_board(self.board, self.origin_x, self.origin_y, self.square, self.game.user_color)
             self.sprites.draw()
-            draw_sidepanel(self.sidepanel_x, 0, self.sidepanel_width, self.window.height, self.game, self.board)
+            draw_sidepanel(self.sidepanel_x, 0, self.sidepanel_width, self.window.height,
+                           self.game, self.board, self.bot.is_thinking)
             self.manager.draw()
 
 
@@ -440,7 +470,8 @@ class GameView(arcade.View):
             button_y <= y <= button_y + button_height):
             # Toggle user color
             self.game.user_color = Color.BLACK if self.game.user_color == Color.WHITE else Color.WHITE
-            # Reset the game
+            # Reset the game, dropping any move the bot was still choosing
+            self.bot.new_game()
             self.board = Board()
             self.game.turn = Color.WHITE  # Fixed: Use Color.WHITE enum, not C.WHITE
             self.game_started = False
@@ -448,10 +479,11 @@ class GameView(arcade.View):
                 self.board, self.square, self.origin_x, self.origin_y, self.game.user_color
             )
 
-            # If user chose black, bot makes first move
+            # If user chose black, bot makes first move (turn passes to the
+            # user once on_update plays it)
             if self.game.user_color == Color.BLACK:
+                self.game.turn = self.game.user_color.opposite()
                 self.make_bot_move()
-                self.game.turn = self.game.user_color  # Set turn to user (BLACK)
                 self.game_started = True
             return
 
@@ -475,35 +507,8 @@ class GameView(arcade.View):
                     self.board.get_piece(tile.piece_here)
                     self.board.highlight_moves()
 
-                    #Check if checkmate or stalemate
-                    piece = tile.get_piece_here()
-                    if piece.piece_type == PieceType.KING:
-                        king_moves = self.board.get_all_legal(piece)
-                        if len(king_moves) == 0:
-
-                            #Check if anyone has moves
-                            all_moves = self.board.get_all_moves(self.game.user_color)
-                            if len(all_moves) == 0:
-
-                                #Checkmate or stalemate
-                                enemy_moves = self.board.get_all_enemy_moves(self.game.user_color)
-
-                                if piece.current_pos in enemy_moves: #Checkmate
-                                    print(f"{self.game.user_color.name} is in CHECKMATE")
-                                    self.board.set_checkmate()
-                                    self.board.set_mate_color(self.game.user_color.opposite())
-                                    return
-
-                                else:
-                                    #Stalemate
-                                    print(f"{self.game.user_color.name} is in STALEMATE")
-                                    self.board.set_stalemate()
-                                    return
-                    
-                    #Check for draws
-                    if self.board.check_draw():
-                        print(f"Stalemate")
-                        self.board.set_stalemate()
+                    #Check for checkmate, stalemate or draws
+                    if self.check_game_over():
                         return
 
                     # Start dragging the sprite
@@ -527,7 +532,6 @@ class GameView(arcade.View):
 
                     self.game.turn = self.game.user_color.opposite()
                     self.make_bot_move()
-                    self.game.turn = self.game.user_color
 
                 else:
                     self.board.selected_piece = None
@@ -551,54 +555,86 @@ class GameView(arcade.View):
                     tile.click()
 
 
+    def check_game_over(self) -> bool:
+        """
+        Ask the board whether the side to move's game has ended and
+        record the result for the side panel
+
+        Returns:
+            True if the game is over, False otherwise
+        """
+        status = self.board.game_status()
+        if status == GameStatus.ONGOING:
+            return False
+
+        color = self.board.active_color
+        if status == GameStatus.CHECKMATE:
+            print(f"{color.name} is in CHECKMATE")
+            self.board.set_checkmate()
+            self.board.set_mate_color(color.opposite())
+        else:
+            # The side panel shows every draw as a stalemate
+            print(f"{color.name}: draw by {status.name}")
+            self.board.set_stalemate()
+        return True
+
     def make_bot_move(self):
-        """Make the bot's move and update the display"""
+        """Start the bot's search on its worker thread; on_update plays the result"""
         bot_color = self.game.user_color.opposite()
-        # Check if we can make a move
+        # Check if we can make a move, handing the turn back if not
         if not self.board.is_curr_pos() or self.board.checkmate or self.board.stalemate:
+            self.game.turn = self.game.user_color
             return None
 
-        # Get all legal moves
-        move_list = self.board.get_all_moves(color=bot_color)
-
-        # Check for checkmate or stalemate
-        if len(move_list) == 0:
-            all_moves = self.board.get_all_enemy_moves(color=bot_color)
-
-            for rank in range(8):
-                for file in range(8):
-                    piece = self.board.grid[rank][file].piece_here
-
-                    if (piece and piece.color == bot_color and
-                            piece.piece_type == PieceType.KING):
-
-                        if piece.current_pos in all_moves:
-                            print(f"{bot_color.name} is in CHECKMATE")
-                            self.board.set_checkmate()
-                            self.board.set_mate_color(bot_color.opposite())
-                            return None
-                        else:
-                            print(f"{bot_color.name} is in STALEMATE")
-                            self.board.set_stalemate()
-                            return None
-        
-        if self.board.check_draw():
-            print(f"stalemate from not enough pieces!")
-            self.board.set_stalemate()
+        # Check for checkmate, stalemate or draws
+        if self.check_game_over():
+            self.game.turn = self.game.user_color
             return None
-        move = self.bot.make_move(self.board, bot_color)
 
-        if move:
-            from_pos, to_pos = move
+        self.bot.start_move(self.board, bot_color)
 
-            # Rebuild sprites to show new board state
-            self.sprites.build_from_board(
-                self.board, self.square, self.origin_x, self.origin_y, self.game.user_color
-            )
+    def on_update(self, delta_time):
+        """
+        Play the bot's move once its worker thread has chosen one
+
+        Args:
+            delta_time: Seconds since the last update
+        """
+        # A finished game (checkmate, draw or resignation) needs no reply
+        if self.board.checkmate or self.board.stalemate:
+            self.bot.cancel_move()
+            return
 
-            # Highlight the bot's move (from and to squares)
-            self.board.grid[from_pos[0]][from_pos[1]].prev_move()
-            self.board.grid[to_pos[0]][to_pos[1]].prev_move()
+        # Wait while the user browses the move history or drags a piece
+        if not self.bot.move_ready() or not self.board.is_curr_pos() or self.dragging_sprite:
+            return
+
+        # Selections made while the bot was thinking are out of date
+        self.board.remove_highlights()
+        move = self.bot.finish_move(self.board)
+        if not move:
+            # A failed Stockfish search starts over with the built-in engine;
+            # a bot left without a move ends the game instead of letting the
+            # user move twice
+            if self.bot.is_thinking:
+                return
+            bot_color = self.game.user_color.opposite()
+            if self.board.active_color == bot_color and not self.check_game_over():
+                self.board.resign(bot_color)
+            self.game.turn = self.game.user_color
+            return
+
+        self.game.turn = self.game.user_color
+        from_pos, to_pos = move
+
+        # Rebuild sprites to show new board state
+        self.sprites.build_from_board(
+            self.board, self.square, self.origin_x, self.origin_y, self.game.user_color
+        )
+
+        # Highlight the bot's move (from and to squares)
+        self.board.grid[from_pos[0]][from_pos[1]].prev_move()
+        self.board.grid[to_pos[0]][to_pos[1]].prev_move()
 
     def get_tile_from_mouse(self, x, y):
         """
@@ -655,24 +691,15 @@ class GameView(arcade.View):
         if self.board.checkmate or self.board.stalemate:
             return
 
-        #Handle captures
+        #Handle captures (the board removes the captured piece itself)
         piece = self.board.grid[rank][file].piece_here
         if piece:
             captured_piece = piece
             self.sprites.remove_sprite_by_piece(captured_piece)
-            self.board.grid[rank][file].piece_here = None
 
-        # Move piece on board and update sprite positions
+        # Move piece on board (promotes pawns on the last rank)
         self.board.move_piece(file, rank)
 
-        # Pawn at end of board (promotion)
-        piece = self.board.grid[rank][file].get_piece_here()
-        if piece and piece.piece_type == PieceType.PAWN:
-            if (rank == 7 and piece.color == Color.WHITE) or (rank == 0 and piece.color == Color.BLACK):
-                print(f"{piece.color.name} PAWN PROMOTED!")
-                piece.promote()
-                self.board.promote(piece.color, file, rank)
-
         # Rebuild sprites to show new board state
         self.sprites.build_from_board(
             self.board, self.square, self.origin_x, self.origin_y, self.game.user_color
@@ -720,13 +747,12 @@ class GameView(arcade.View):
             if file is not None and rank is not None:
                 tile = self.board.grid[rank][file]
 
-                if tile.highlighted:
+                if tile.highlighted and self.game.turn == self.game.user_color:
                     # Valid move
                     self.board.remove_highlights()
                     self.move_piece_and_update_sprites(file, rank)
                     self.game.turn = self.game.user_color.opposite()
                     self.make_bot_move()
-                    self.game.turn = self.game.user_color
                 else:
                     # Invalid move - snap back to original position
                     orig_file, orig_rank = self.drag_start_pos
@@ -782,16 +808,10 @@ class GameView(arcade.View):
 
     def show_prev_move(self):
         ''' Goes backwards one move in history'''
-        if self.board.current_index > 0:
-            self.board.current_index -= 1
-            move = self.board.move_history[self.board.current_index]
-            self.board.load_fen(move["FEN"])
+        if self.board.step_back():
             self.sprites.build_from_board(self.board, self.square, self.origin_x, self.origin_y, self.game.user_color)
 
     def show_next_move(self):
         ''' Goes forward one move in history '''
-        if self.board.current_index < len(self.board.move_history) - 1:
-            self.board.current_index += 1
-            move = self.board.move_history[self.board.current_index]
-            self.board.load_fen(move["FEN"])
+        if self.board.step_forward():
             self.sprites.build_from_board(self.board, self.square, self.origin_x, self.origin_y, self.game.user_color)
\ No newline at end of file
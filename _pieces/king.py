@@ -1,17 +1,21 @@
 """
 Models king for game use
 """
-from dataclasses import dataclass
 from _enums.piece_type import PieceType
 from _enums.color import Color
+from _enums.piece_value import PieceValue
 from _pieces.piece import Piece
+from _board.attacks import KING_ATTACKS
+from _board.bitboard import squares_to_coords
+from _board.castling import (BLACK_KINGSIDE, BLACK_QUEENSIDE,
+                             WHITE_KINGSIDE, WHITE_QUEENSIDE)
 
 ### -- PYLINT NOTES -- ###
 # current_pos initialized in parent class
 # __init__ calls super class current_pos assignment, sets self.current_pos
 
 # unused arg 'board' used in move method to track has_moved boolean
-# has_moved is REQUIRED for tracking a player's ability to castle
+# castling itself is decided by the board's castling rights
 
 # 16 local vars required to implement king piece functionality
 
@@ -19,12 +23,11 @@ from _pieces.piece import Piece
 # decreasing method override consistency between piece classes
 ### ------------------ ###
 
-@dataclass
 class King(Piece):
     """
     Class representing the king piece
     """
-    has_moved: bool = False
+    __slots__ = ("has_moved",)
 
     def __init__(self, color: Color, start_pos: tuple):
         """
@@ -34,9 +37,8 @@ class King(Piece):
             color: Color of the piece (White or Black)
             start_pos: Starting position as (file, rank)
         """
-        piece_value = 1000
-        super().__init__(PieceType.KING, color, piece_value, start_pos)
-        self.piece_type = PieceType.KING
+        super().__init__(PieceType.KING, color, PieceValue.KING, start_pos)
+        self.has_moved = False
 
     def move(self, new_square: tuple[int, int], board: "Board"):
         """
@@ -55,72 +57,60 @@ class King(Piece):
 
         Args:
             board: The game board
-            ignore_checks: If True, skip castling logic to prevent recursion
+            ignore_checks: If True, skip castling logic
         Returns:
             List of legal move positions as (file, rank) tuples
         """
-        legal_moves = []
-        position = self.current_pos
-
-        # Legal moves for King
-        move_list = [(1, 0),
-                     (1, 1),
-                     (1, -1),
-                     (-1, -1),
-                     (-1, 0),
-                     (-1, 1),
-                     (0, 1),
-                     (0, -1)]
-
-        for x_offset, y_offset in move_list:
-            check_square = (position[0] + x_offset, position[1] + y_offset)
-
-            # Ensure square is within bounds and not a friendly piece
-            if 0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7:
-                tile = board.grid[check_square[1]][check_square[0]]
-
-                # See what piece is on the board; from tile.py
-                if not tile.has_piece() or tile.is_other_color(self.color):
-                    legal_moves.append((check_square[0], check_square[1]))
+        return squares_to_coords(self.get_move_mask(board, ignore_checks))
+
+    def get_move_mask(self, board, ignore_checks: bool = False) -> int:
+        """
+        Get all pseudo-legal target squares for the king
+
+        Args:
+            board: The game board
+            ignore_checks: If True, skip castling logic
+        Returns:
+            Bitboard of target squares, castling squares included
+        """
+        legal_moves = KING_ATTACKS[self.get_square()] & ~board.occupancy[self.color]
 
         # Skip checking for castling if ignore checks turned on
-        # Prevents recursion
         if ignore_checks:
             return legal_moves
 
+        if self.color == Color.WHITE:
+            row = 0
+            kingside, queenside = WHITE_KINGSIDE, WHITE_QUEENSIDE
+        else:
+            row = 7
+            kingside, queenside = BLACK_KINGSIDE, BLACK_QUEENSIDE
+
         # CASTLING
-        if not self.has_moved and not board.check_for_checks(self.color):
-
-            if self.color == Color.WHITE:
-                row = 0
-            else:
-                row = 7
-
-            king_rook_tile = board.grid[row][7]
-            king_rook = king_rook_tile.piece_here
-
-            # Ensure rook has not moved
-            if king_rook and king_rook.piece_type == PieceType.ROOK:
-                rook = king_rook_tile.piece_here
-
-                if not rook.has_moved:
-                    # Ensure castling squares have no pieces occupying
-                    if (not board.grid[row][5].has_piece() and
-                            not board.grid[row][6].has_piece()):
-                        legal_moves.append((6, row))
-
-            queen_rook_tile = board.grid[row][0]
-            queen_rook = queen_rook_tile.piece_here
-
-            # Ensure rook has not moved
-            if queen_rook and queen_rook.piece_type == PieceType.ROOK:
-                rook = queen_rook_tile.piece_here
-
-                if not rook.has_moved:
-                    # Ensure castling squares have no pieces occupying
-                    if (not board.grid[row][1].has_piece() and
-                            not board.grid[row][2].has_piece() and
-                            not board.grid[row][3].has_piece()):
-                        legal_moves.append((2, row))
+        rights = board.castling_rights
+        if (rights & (kingside | queenside) and self.current_pos == (4, row) and
+                not board.check_for_checks(self.color)):
+            enemy_color = self.color.opposite()
+
+            # Ensure the right is still held and the rook is there
+            king_rook = board.grid[row][7].piece_here
+            if (rights & kingside and king_rook and
+                    king_rook.piece_type == PieceType.ROOK and king_rook.color == self.color):
+                # Ensure castling squares are empty and the king
+                # does not pass through an attacked square
+                if (not board.occupied & (0b0110_0000 << (row * 8)) and
+                        not board.is_square_attacked((5, row), enemy_color) and
+                        not board.is_square_attacked((6, row), enemy_color)):
+                    legal_moves |= 1 << (row * 8 + 6)
+
+            queen_rook = board.grid[row][0].piece_here
+            if (rights & queenside and queen_rook and
+                    queen_rook.piece_type == PieceType.ROOK and queen_rook.color == self.color):
+                # Ensure castling squares are empty and the king
+                # does not pass through an attacked square
+                if (not board.occupied & (0b0000_1110 << (row * 8)) and
+                        not board.is_square_attacked((3, row), enemy_color) and
+                        not board.is_square_attacked((2, row), enemy_color)):
+                    legal_moves |= 1 << (row * 8 + 2)
 
         return legal_moves
@@ -1,24 +1,22 @@
 """
 Models pawn for game use
 """
-from dataclasses import dataclass
 from _enums.piece_type import PieceType
 from _enums.color import Color
 from _enums.piece_value import PieceValue
 from _pieces.piece import Piece
+from _board.attacks import PAWN_ATTACKS, pawn_pushes
 
 ### -- PYLINT NOTES -- ###
 # current_pos initialized in parent class
 # __init__ calls super class current_pos assignment, sets self.current_pos
 ### ------------------ ###
 
-@dataclass
 class Pawn(Piece):
     """
     Class representing the pawn piece
     """
-    has_moved: bool = False
-    en_passant_move: tuple[int, int] = None
+    __slots__ = ("has_moved",)
 
     def __init__(self, color: Color, start_pos: tuple):
         """
@@ -29,6 +27,7 @@ class Pawn(Piece):
             start_pos: Starting position as (file, rank)
         """
         super().__init__(PieceType.PAWN, color, PieceValue.PAWN, start_pos)
+        self.has_moved = False
 
     def move(self, new_square: tuple[int, int], board: "Board"):
         """
@@ -50,108 +49,25 @@ class Pawn(Piece):
         else:
             board.en_passant_target = None
 
-    def get_moves(self, board):
+    def get_move_mask(self, board) -> int:
         """
-        Get all legal moves for the pawn
+        Get all pseudo-legal target squares for the pawn
 
         Args:
             board: The game board
         Returns:
-            List of legal move positions as (file, rank) tuples
+            Bitboard of push and capture squares
         """
+        square = self.get_square()
 
-        if self.piece_type == PieceType.PAWN:
-            legal_moves = []
-            position = self.current_pos
+        # Pushes, then diagonal takes of enemy pieces
+        legal_moves = pawn_pushes(square, self.color, board.occupied)
+        legal_moves |= PAWN_ATTACKS[self.color][square] & board.occupancy[self.color.opposite()]
 
-            if self.color == Color.WHITE:
-                direction = 1
-            else:
-                direction = -1
+        # En passant onto the square the enemy pawn skipped; only valid on
+        # the rank in front of this color's fifth rank
+        target = board.en_passant_target
+        if target and target[1] == (5 if self.color == Color.WHITE else 2):
+            legal_moves |= PAWN_ATTACKS[self.color][square] & (1 << (target[1] * 8 + target[0]))
 
-            regular_move = (0, direction)
-            first_move = (0, 2 * direction)
-            takes = [(1, direction), (-1, direction)]
-            en_passant_moves = [(-1, 0), (1, 0)]
-
-            # Check for standard move
-            check_square = (position[0] + regular_move[0], position[1] + regular_move[1])
-
-            if 0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7:
-                tile = board.grid[check_square[1]][check_square[0]]
-
-                if not tile.has_piece():
-                    legal_moves.append(check_square)
-
-            # Check for first move
-            if not self.has_moved:
-                check_square = (position[0] + first_move[0], position[1] + first_move[1])
-                check_empty = (position[0], position[1] + direction)
-
-                if 0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7:
-                    tile = board.grid[check_square[1]][check_square[0]]
-                    empty_tile = board.grid[check_empty[1]][check_empty[0]]
-
-                    if not tile.has_piece() and not empty_tile.has_piece():
-                        legal_moves.append(check_square)
-
-            # Check for takes
-            for x, y in takes:
-                check_square = (position[0] + x, position[1] + y)
-
-                # Ensure square is within bounds and not a friendly piece
-                if 0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7:
-                    tile = board.grid[check_square[1]][check_square[0]]
-
-                    # See what piece is on the board; from tile.py
-                    if tile.has_piece() and tile.is_other_color(self.color):
-                        legal_moves.append(check_square)
-
-            # Check for en passant
-            for x, y in en_passant_moves:
-                check_square = (position[0] + x, position[1] + y)
-
-                if check_square == board.en_passant_target:
-                    legal_moves.append((check_square[0], check_square[1] + direction))
-
-            return legal_moves
-        
-        #For promotion
-        if self.piece_type == PieceType.QUEEN:
-            legal_moves = []
-            position = self.current_pos
-
-            # Potential moves
-            possibilities = [
-                (0, 1),
-                (0, -1),
-                (1, 0),
-                (-1, 0),
-                (1, 1),
-                (1, -1),
-                (-1, 1),
-                (-1, -1),
-            ]
-
-            for x_pos, y_pos in possibilities:
-                counter = 1
-
-                while True:
-                    check_square = position[0] + x_pos * counter, position[1] + y_pos * counter
-
-                    # Ensure square is within bounds of board
-                    if not (0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7):
-                        break
-
-                    tile = board.grid[check_square[1]][check_square[0]]
-
-                    if tile is not None and tile.has_piece():
-                        if tile.is_same_color(self.color):
-                            break
-                        legal_moves.append(check_square)
-                        break
-
-                    legal_moves.append(check_square)
-                    counter += 1
-
-            return legal_moves
+        return legal_moves
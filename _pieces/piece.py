@@ -4,6 +4,7 @@ Models generic piece object for game use
 from _enums.color import Color
 from _enums.piece_value import PieceValue
 from _enums.piece_type import PieceType
+from _board.bitboard import squares_to_coords
 
 ### -- PYLINT NOTES -- ###
 # 8 instance attributes required to store piece data/implement piece functionality
@@ -13,7 +14,12 @@ from _enums.piece_type import PieceType
 class Piece:
     """
     General piece class representing a chess piece
+
+    Pieces use __slots__ rather than a per-instance __dict__; subclasses
+    declare any extra state (such as has_moved) in their own __slots__.
     """
+    __slots__ = ("piece_type", "color", "start_pos", "current_pos", "piece_value",
+                 "_destination_point", "change_x", "change_y")
 
     def __init__(self, piece_type: PieceType, color: Color,
                  piece_value: PieceValue, start_pos: tuple):
@@ -44,6 +50,18 @@ class Piece:
         """
         return f"{self.color.name} {self.piece_type.name}"
 
+    def copy(self) -> "Piece":
+        """
+        Make an independent copy of the piece, as used by Board.clone()
+
+        Returns:
+            A new piece of the same class with the same attribute values
+        """
+        piece = object.__new__(type(self))
+        for name in _slot_names(type(self)):
+            setattr(piece, name, getattr(self, name))
+        return piece
+
     def delete(self):
         """
         Mark piece as deleted by setting position to None
@@ -72,18 +90,38 @@ class Piece:
         _ = board
         self.current_pos = new_square
 
-    def get_moves(self, board: "Board"):
+    def get_square(self) -> int:
         """
-        Get all possible moves for this piece
+        Get the square index of the piece
+
+        Returns:
+            Current position as a square index (rank * 8 + file)
+        """
+        return self.current_pos[1] * 8 + self.current_pos[0]
+
+    def get_move_mask(self, board: "Board") -> int:
+        """
+        Get all possible target squares for this piece as a bitboard
 
         Args:
             board: The game board (unused in base class)
         Returns:
-            List of valid move positions
+            Bitboard of pseudo-legal target squares
         """
         # _board unused by this class, but required for specific piece overrides
         _ = board
-        return []
+        return 0
+
+    def get_moves(self, board: "Board"):
+        """
+        Get all possible moves for this piece
+
+        Args:
+            board: The game board
+        Returns:
+            List of valid move positions
+        """
+        return squares_to_coords(self.get_move_mask(board))
 
     @property
     def destination_point(self):
@@ -106,12 +144,16 @@ class Piece:
         self._destination_point = destination_point
         self.change_x = 0.0
         self.change_y = 0.0
-    
-    def promote(self):
-        """
-        Promote a pawn to a queen
-        """
-        if self.piece_type == PieceType.PAWN:
-            self.piece_type = PieceType.QUEEN
-            self.piece_value = PieceValue.QUEEN
 
+
+_SLOT_NAMES = {}
+
+
+def _slot_names(piece_class: type) -> tuple[str, ...]:
+    """Collect the __slots__ of a piece class and its bases, once per class"""
+    names = _SLOT_NAMES.get(piece_class)
+    if names is None:
+        names = tuple(name for cls in piece_class.__mro__
+                      for name in cls.__dict__.get("__slots__", ()))
+        _SLOT_NAMES[piece_class] = names
+    return names
@@ -1,11 +1,11 @@
 """
 Models rook for game use
 """
-from dataclasses import dataclass
 from _enums.piece_type import PieceType
 from _enums.color import Color
 from _enums.piece_value import PieceValue
 from _pieces.piece import Piece
+from _board.attacks import rook_attacks
 
 ### -- PYLINT NOTES -- ###
 # current_pos initialized in parent class
@@ -15,12 +15,11 @@ from _pieces.piece import Piece
 # has_moved is REQUIRED for tracking a player's ability to castle
 ### ------------------ ###
 
-@dataclass
 class Rook(Piece):
     """
     Class representing the rook piece
     """
-    has_moved: bool = False
+    __slots__ = ("has_moved",)
 
     def __init__(self, color: Color, start_pos: tuple[int, int]):
         """
@@ -31,6 +30,7 @@ class Rook(Piece):
             start_pos: Starting position as (file, rank)
         """
         super().__init__(PieceType.ROOK, color, PieceValue.ROOK, start_pos)
+        self.has_moved = False
 
     def move(self, new_square: tuple[int, int], board: "Board"):
         """
@@ -43,42 +43,13 @@ class Rook(Piece):
         self.current_pos = new_square
         self.has_moved = True
 
-    def get_moves(self, board) -> list[tuple[int, int]]:
+    def get_move_mask(self, board) -> int:
         """
-        Get all legal moves for the rook
+        Get all pseudo-legal target squares for the rook
 
         Args:
             board: The game board
         Returns:
-            List of legal move positions as (file, rank) tuples
+            Bitboard of target squares, one table lookup on the occupancy
         """
-        legal_moves = []
-        position = self.current_pos
-
-        move_list = [(-1, 0),
-                     (1, 0),
-                     (0, -1),
-                     (0, 1)]
-
-        for x_pos, y_pos in move_list:
-            counter = 1
-
-            while True:
-                check_square = position[0] + x_pos * counter, position[1] + y_pos * counter
-
-                # Ensure square is within bounds of board
-                if not (0 <= check_square[0] <= 7 and 0 <= check_square[1] <= 7):
-                    break
-
-                tile = board.grid[check_square[1]][check_square[0]]
-
-                if tile is not None and tile.has_piece():
-                    if tile.is_same_color(self.color):
-                        break
-                    legal_moves.append(check_square)
-                    break
-
-                legal_moves.append(check_square)
-                counter += 1
-
-        return legal_moves
+        return rook_attacks(self.get_square(), board.occupied) & ~board.occupancy[self.color]
@@ -15,7 +15,11 @@ def main():
     window = arcade.Window(screen_width, screen_height, screen_title)
     view = GameView(screen_width, screen_height, screen_title)
     window.show_view(view)
-    arcade.run()
+    try:
+        arcade.run()
+    finally:
+        # Quit the engine process instead of leaving it to the collector
+        view.bot.close()
 
 if __name__ == "__main__":
     main()